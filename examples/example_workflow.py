@@ -10,22 +10,18 @@ NOTE: Run this script from the parent directory:
     python examples/example_workflow.py
 """
 
-import subprocess
+import asyncio
 import os
 
 
-def run_command(cmd: list[str]) -> int:
-    """Run a command and return the exit code."""
+async def run_command(cmd: list[str]) -> int:
+    """Run a command without blocking the event loop and return the exit code."""
     print(f"Running: {' '.join(cmd)}")
-    try:
-        result = subprocess.run(cmd, check=False)
-        return result.returncode
-    except KeyboardInterrupt:
-        print("\nOperation cancelled by user")
-        return 1
+    proc = await asyncio.create_subprocess_exec(*cmd)
+    return await proc.wait()
 
 
-def main():
+async def main():
     """Example workflow: stream posts and generate periodic summaries."""
     # Ensure we're in the correct directory
     if not os.path.exists("src/bluesky_summarizer"):
@@ -72,20 +68,19 @@ def main():
         "--save",
     ]
 
-    exit_code = run_command(summary_cmd)
+    exit_code = await run_command(summary_cmd)
     if exit_code != 0:
         print("❌ Summary generation failed")
         return exit_code
 
-    # Example 3: Check status
+    # Examples 3 & 4 are independent, so run them concurrently
     print("\n3. Checking system status...")
     status_cmd = ["python", "-m", "src.bluesky_summarizer.cli", "status"]
-    run_command(status_cmd)
 
-    # Example 4: View recent posts
     print("\n4. Viewing recent posts...")
     posts_cmd = ["python", "-m", "src.bluesky_summarizer.cli", "posts", "--limit", "5"]
-    run_command(posts_cmd)
+
+    await asyncio.gather(run_command(status_cmd), run_command(posts_cmd))
 
     print("\n✅ Workflow example completed!")
     print("\nNext steps:")
@@ -95,4 +90,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\nOperation cancelled by user")
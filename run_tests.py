@@ -4,6 +4,7 @@ Simple test runner for the Bluesky Feed Summarizer.
 Run this script to execute all tests and verify the application works correctly.
 """
 
+import importlib.util
 import subprocess
 import sys
 import os
@@ -23,12 +24,17 @@ def run_tests() -> bool:
         sys.executable,
         "-m",
         "pytest",
-        "tests/test_bluesky_summarizer.py",
+        "tests",
         "-v",
         "--tb=short",
         "--disable-warnings",  # Hide deprecation warnings for cleaner output
     ]
 
+    # Spread test files across CPU cores when pytest-xdist is installed;
+    # loadfile keeps each file (and its shared test database) on one worker
+    if importlib.util.find_spec("xdist") is not None:
+        cmd += ["-n", "auto", "--dist=loadfile"]
+
     try:
         subprocess.run(cmd, check=True)
         print("\n✅ All tests passed! The application is working correctly.")
@@ -17,6 +17,10 @@ setup(
         "pydantic>=2.11.7",
         "rich>=14.0.0",
     ],
+    extras_require={
+        "http2": ["httpx[http2]"],
+        "dev": ["pytest>=7.0.0", "pytest-mock>=3.0.0", "pytest-xdist>=3.0.0"],
+    },
     entry_points={
         "console_scripts": [
             "bluesky-summarizer=bluesky_summarizer.cli:main",
@@ -8,13 +8,28 @@ __version__ = "1.0.0"
 __author__ = "Your Name"
 __email__ = "your.email@example.com"
 
-# Import main components for easier access
-from .database import DatabaseManager
-from .bluesky import BlueSkyClient
-from .ai import ClaudeSummarizer
-from .streaming import StreamingService
+from importlib import import_module
+
 from .config import config
 
+# Main components are imported lazily (PEP 562) so that importing the package,
+# e.g. for DB-only CLI commands, does not pull in the anthropic/atproto SDKs.
+_LAZY_EXPORTS = {
+    "DatabaseManager": ".database",
+    "BlueSkyClient": ".bluesky",
+    "ClaudeSummarizer": ".ai",
+    "StreamingService": ".streaming",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 __all__ = [
     "DatabaseManager",
     "BlueSkyClient",
@@ -0,0 +1,57 @@
+"""
+Engagement statistics included in summarization prompts.
+"""
+
+import heapq
+from collections import Counter
+from statistics import quantiles
+from typing import Dict, List
+
+from ..database.models import Post
+
+
+def _engagement(post: Post) -> int:
+    return post.like_count + post.repost_count + post.reply_count
+
+
+def top_k_by_likes(posts: List[Post], k: int = 3) -> List[Post]:
+    """Return the ``k`` most liked posts (O(n log k))."""
+    return heapq.nlargest(k, posts, key=lambda p: p.like_count)
+
+
+def hour_histogram(posts: List[Post]) -> List[int]:
+    """Return post counts per hour of day (UTC), indexed 0-23."""
+    counts = Counter(p.created_at.hour for p in posts)
+    return [counts.get(hour, 0) for hour in range(24)]
+
+
+def engagement_percentiles(posts: List[Post]) -> Dict[str, float]:
+    """Return the median and 90th percentile of total engagement."""
+    values = [_engagement(p) for p in posts]
+    if len(values) < 2:
+        value = float(values[0]) if values else 0.0
+        return {"p50": value, "p90": value}
+    deciles = quantiles(values, n=10, method="inclusive")
+    return {"p50": deciles[4], "p90": deciles[8]}
+
+
+def format_stats_block(posts: List[Post]) -> str:
+    """Build a compact, pre-aggregated stats block for the prompt."""
+    if not posts:
+        return ""
+
+    percentiles = engagement_percentiles(posts)
+    histogram = hour_histogram(posts)
+    busiest = sorted(range(24), key=lambda h: (-histogram[h], h))[:3]
+    top = top_k_by_likes(posts)
+
+    lines = [
+        "Feed statistics:",
+        f"- Posts: {len(posts)}, distinct authors: {len({p.author_handle for p in posts})}",
+        f"- Engagement per post: median {percentiles['p50']:g}, p90 {percentiles['p90']:g}",
+        "- Busiest hours (UTC): "
+        + ", ".join(f"{h:02d}:00 ({histogram[h]})" for h in busiest if histogram[h]),
+        "- Most liked: "
+        + ", ".join(f"@{p.author_handle} ({p.like_count} likes)" for p in top),
+    ]
+    return "\n".join(lines)
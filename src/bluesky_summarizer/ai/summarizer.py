@@ -3,15 +3,66 @@ Claude AI summarizer for Bluesky feed content.
 """
 
 import logging
+import time
+from functools import lru_cache
+from operator import attrgetter
 from datetime import datetime, timezone
-from typing import List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from anthropic import Anthropic
 from ..database.models import Post, Summary
 from ..config import config
+from .stats import format_stats_block
 
 
 logger = logging.getLogger(__name__)
 
+# Conservative average for English social media text with Claude's tokenizer
+CHARS_PER_TOKEN = 4
+
+# Fixed instructions sent as the cached system prefix; kept as a single
+# module-level constant so every request reuses the identical string
+SUMMARY_INSTRUCTIONS = """You will be given a batch of Bluesky social media posts collected over a date range. Please analyze and summarize them.
+
+Your summary should include:
+
+1. **Key Themes**: What are the main topics and themes discussed?
+2. **Notable Conversations**: Highlight any particularly engaging or important discussions
+3. **Trending Topics**: What subjects seem to be getting the most attention?
+4. **Sentiment Overview**: What's the general mood or sentiment of the posts?
+5. **Interesting Insights**: Any notable patterns, insights, or observations
+
+Please provide a concise but comprehensive summary that captures the essence of the social media activity during this period. Focus on the most important and engaging content.
+
+Please provide your summary in a clear, well-structured format with appropriate headings."""
+
+# Fields rendered per post, read in a single C-level call per Post
+_POST_FORMAT_FIELDS = attrgetter(
+    "author_handle",
+    "created_at",
+    "text",
+    "like_count",
+    "repost_count",
+    "reply_count",
+)
+
+
+@lru_cache(maxsize=50_000)
+def _format_post_body(
+    author_handle: str,
+    created_at: datetime,
+    text: str,
+    like_count: int,
+    repost_count: int,
+    reply_count: int,
+) -> str:
+    """Format a single post's metadata and content (memoized on its fields)."""
+    return f"""Author: @{author_handle}
+Time: {created_at.strftime("%Y-%m-%d %H:%M:%S")}
+Engagement: {like_count} likes, {repost_count} reposts, {reply_count} replies
+Content: {text}
+
+---"""
+
 
 class ClaudeSummarizer:
     """Claude AI-powered text summarizer for Bluesky posts."""
@@ -28,7 +79,11 @@ class ClaudeSummarizer:
         self.model = model
 
     def summarize_posts(
-        self, posts: List[Post], start_date: datetime, end_date: datetime
+        self,
+        posts: List[Post],
+        start_date: datetime,
+        end_date: datetime,
+        on_token: Optional[Callable[[str], None]] = None,
     ) -> Summary:
         """
         Summarize a list of Bluesky posts using Claude AI.
@@ -37,6 +92,7 @@ class ClaudeSummarizer:
             posts: List of Post objects to summarize
             start_date: Start date of the posts
             end_date: End date of the posts
+            on_token: Optional callback receiving summary text as it streams in
 
         Returns:
             Summary object containing the generated summary
@@ -52,22 +108,14 @@ class ClaudeSummarizer:
                 created_at=datetime.now(timezone.utc),
             )
 
-        # Apply truncation based on max_prompt_chars
-        truncated_posts = self._truncate_posts(posts, config.app.max_prompt_chars)
-        posts_text = self._format_posts_for_summarization(truncated_posts)
-
-        # Create the prompt
-        prompt = self._create_summarization_prompt(
-            posts_text, start_date, end_date, len(truncated_posts)
+        truncated_posts, payload = self._prepare_summary_payload(
+            posts, start_date, end_date
         )
 
         try:
             # Call Claude API
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=1000,
-                temperature=0.3,
-                messages=[{"role": "user", "content": prompt}],
+            response = self._create_message(
+                self._static_instructions(), payload, on_token
             )
 
             summary_text = response.content[0].text
@@ -93,22 +141,118 @@ class ClaudeSummarizer:
             logger.error(f"Error generating summary with Claude: {e}")
             raise
 
-    def _format_posts_for_summarization(self, posts: List[Post]) -> str:
-        """Format posts into a text block for summarization."""
-        formatted_posts = []
+    def summarize_posts_batched(
+        self,
+        jobs: List[Tuple[List[Post], datetime, datetime]],
+        poll_interval: float = 5.0,
+    ) -> List[Summary]:
+        """
+        Summarize several post windows with a single Message Batches request.
 
-        for i, post in enumerate(posts, 1):
-            # Format each post with metadata
-            post_text = f"""Post {i}:
-Author: @{post.author_handle}
-Time: {post.created_at.strftime("%Y-%m-%d %H:%M:%S")}
-Engagement: {post.like_count} likes, {post.repost_count} reposts, {post.reply_count} replies
-Content: {post.text}
+        All jobs share the cached instruction prefix. The call blocks, polling
+        every ``poll_interval`` seconds, until the batch has ended.
 
----"""
-            formatted_posts.append(post_text)
+        Args:
+            jobs: List of (posts, start_date, end_date) tuples
+            poll_interval: Seconds to wait between batch status checks
+
+        Returns:
+            List of Summary objects in the same order as ``jobs``
+        """
+        summaries: List[Optional[Summary]] = [None] * len(jobs)
+        requests = []
+        post_counts: Dict[str, int] = {}
+
+        for index, (posts, start_date, end_date) in enumerate(jobs):
+            if not posts:
+                summaries[index] = self.summarize_posts(posts, start_date, end_date)
+                continue
+            truncated_posts, payload = self._prepare_summary_payload(
+                posts, start_date, end_date
+            )
+            custom_id = f"summary-{index}"
+            post_counts[custom_id] = len(truncated_posts)
+            requests.append(
+                {
+                    "custom_id": custom_id,
+                    "params": self._message_params(
+                        self._static_instructions(), payload
+                    ),
+                }
+            )
+
+        if not requests:
+            return summaries  # type: ignore[return-value]
+
+        try:
+            batch = self.client.messages.batches.create(requests=requests)
+            while batch.processing_status != "ended":
+                time.sleep(poll_interval)
+                batch = self.client.messages.batches.retrieve(batch.id)
+
+            failed = []
+            for result in self.client.messages.batches.results(batch.id):
+                if result.result.type != "succeeded":
+                    failed.append(result.custom_id)
+                    continue
+                index = int(result.custom_id.rsplit("-", 1)[1])
+                _, start_date, end_date = jobs[index]
+                summaries[index] = Summary(
+                    id=None,
+                    start_date=start_date,
+                    end_date=end_date,
+                    post_count=post_counts[result.custom_id],
+                    summary_text=result.result.message.content[0].text,
+                    model_used=self.model,
+                    created_at=datetime.now(timezone.utc),
+                )
+
+            if failed:
+                raise RuntimeError(
+                    f"Batch {batch.id} had failed requests: {', '.join(sorted(failed))}"
+                )
+
+            logger.info(
+                "Generated %s summaries in batch %s using %s",
+                len(requests),
+                batch.id,
+                self.model,
+            )
+            return summaries  # type: ignore[return-value]
+
+        except Exception as e:
+            logger.error(f"Error generating batched summaries with Claude: {e}")
+            raise
+
+    def _prepare_summary_payload(
+        self, posts: List[Post], start_date: datetime, end_date: datetime
+    ) -> Tuple[List[Post], str]:
+        """Truncate posts to the prompt budget and build the uncached payload."""
+        # The estimated token budget is the binding limit with the default
+        # settings; the char cap only backstops a loose MAX_PROMPT_TOKENS
+        budget = min(
+            config.app.max_prompt_chars,
+            config.app.max_prompt_tokens * CHARS_PER_TOKEN,
+        )
+        truncated_posts = self._truncate_posts(posts, budget)
+        posts_text = self._format_posts_for_summarization(truncated_posts)
 
-        return "\n".join(formatted_posts)
+        # Static instructions are cached separately; only posts vary per call
+        payload = self._dynamic_payload(
+            posts_text,
+            start_date,
+            end_date,
+            len(truncated_posts),
+            stats_text=format_stats_block(posts),
+        )
+        return truncated_posts, payload
+
+    def _format_posts_for_summarization(self, posts: List[Post]) -> str:
+        """Format posts into a text block for summarization."""
+        return "\n".join(
+            f"Post {i}:\n{_format_post_body(*fields)}"
+            for i, fields in enumerate(map(_POST_FORMAT_FIELDS, posts), 1)
+        )
 
     def _truncate_posts(self, posts: List[Post], max_chars: int) -> List[Post]:
         """Truncate posts list to fit within character budget when formatted.
@@ -117,6 +261,7 @@ Content: {post.text}
           1. Sort by engagement (likes + reposts + replies) descending, then recency.
           2. Keep adding formatted length until budget would be exceeded.
           3. Fall back to chronological if all have zero engagement.
+          4. Return the selected posts in chronological order.
         """
         if not posts:
             return posts
@@ -149,36 +294,78 @@ Content: {post.text}
                 break
             selected.append(cand)
             total_chars += frag_len
+        selected.sort(key=attrgetter("created_at"))
         return selected
 
-    def _create_summarization_prompt(
-        self, posts_text: str, start_date: datetime, end_date: datetime, post_count: int
+    def _static_instructions(self) -> str:
+        """Return the fixed summarization instructions (cacheable prompt prefix)."""
+        return SUMMARY_INSTRUCTIONS
+
+    def _dynamic_payload(
+        self,
+        posts_text: str,
+        start_date: datetime,
+        end_date: datetime,
+        post_count: int,
+        stats_text: str = "",
     ) -> str:
-        """Create a prompt for Claude to summarize the posts."""
+        """Create the per-request part of the prompt (date range, stats and posts)."""
 
         date_range = (
             f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
         )
+        stats_section = f"{stats_text}\n\n" if stats_text else ""
 
-        prompt = f"""Please analyze and summarize the following {post_count} Bluesky social media posts from {date_range}.
+        return f"""{stats_section}Here are the {post_count} posts from {date_range}:
 
-Your summary should include:
-
-1. **Key Themes**: What are the main topics and themes discussed?
-2. **Notable Conversations**: Highlight any particularly engaging or important discussions
-3. **Trending Topics**: What subjects seem to be getting the most attention?
-4. **Sentiment Overview**: What's the general mood or sentiment of the posts?
-5. **Interesting Insights**: Any notable patterns, insights, or observations
-
-Please provide a concise but comprehensive summary that captures the essence of the social media activity during this period. Focus on the most important and engaging content.
-
-Here are the posts:
-
-{posts_text}
-
-Please provide your summary in a clear, well-structured format with appropriate headings."""
+{posts_text}"""
 
-        return prompt
+    def _message_params(self, system_text: str, user_text: str) -> Dict[str, Any]:
+        """Build request params with ``system_text`` as a cached prefix."""
+        return {
+            "model": self.model,
+            "max_tokens": 1000,
+            "temperature": 0.3,
+            "system": [
+                {
+                    "type": "text",
+                    "text": system_text,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ],
+            "messages": [
+                {"role": "user", "content": [{"type": "text", "text": user_text}]}
+            ],
+        }
+
+    def _create_message(
+        self,
+        system_text: str,
+        user_text: str,
+        on_token: Optional[Callable[[str], None]] = None,
+    ):
+        """Call Claude with ``system_text`` as a cached prefix and ``user_text`` uncached.
+
+        When ``on_token`` is given the response is streamed and each text delta
+        is passed to it as it arrives; the final message is returned either way.
+        """
+        params = self._message_params(system_text, user_text)
+        if on_token is None:
+            response = self.client.messages.create(**params)
+        else:
+            with self.client.messages.stream(**params) as stream:
+                for text in stream.text_stream:
+                    on_token(text)
+                response = stream.get_final_message()
+
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            logger.debug(
+                "Prompt cache usage: read=%s created=%s",
+                getattr(usage, "cache_read_input_tokens", None),
+                getattr(usage, "cache_creation_input_tokens", None),
+            )
+        return response
 
     def generate_custom_summary(
         self,
@@ -186,6 +373,7 @@ Please provide your summary in a clear, well-structured format with appropriate
         custom_prompt: str,
         start_date: datetime,
         end_date: datetime,
+        on_token: Optional[Callable[[str], None]] = None,
     ) -> Summary:
         """
         Generate a summary with a custom prompt.
@@ -195,6 +383,7 @@ Please provide your summary in a clear, well-structured format with appropriate
             custom_prompt: Custom prompt for summarization
             start_date: Start date of the posts
             end_date: End date of the posts
+            on_token: Optional callback receiving summary text as it streams in
 
         Returns:
             Summary object containing the generated summary
@@ -212,19 +401,13 @@ Please provide your summary in a clear, well-structured format with appropriate
 
         posts_text = self._format_posts_for_summarization(posts)
 
-        full_prompt = f"""{custom_prompt}
-
-Here are the posts to analyze:
+        payload = f"""Here are the posts to analyze:
 
 {posts_text}"""
 
         try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=1000,
-                temperature=0.3,
-                messages=[{"role": "user", "content": full_prompt}],
-            )
+            # The custom prompt is the cached prefix so repeated runs reuse it
+            response = self._create_message(custom_prompt, payload, on_token)
 
             summary_text = response.content[0].text
 
@@ -2,36 +2,99 @@
 Bluesky API client for fetching timeline posts.
 """
 
+import json
 import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from operator import attrgetter
 from datetime import datetime, timezone
-from typing import List, Optional
-from atproto import Client, models
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import httpx
+from atproto import Client, SessionEvent, models
+from atproto_client.request import Request
 from ..database.models import Post
 from ..config import config
+from ..utils.dates import parse_atproto_timestamp
 from ..utils.retry import retry
 
+try:
+    from atproto_client.exceptions import RateLimitExceededError
+except ImportError:  # older atproto raises the generic RequestException on HTTP 429
+    from atproto_client.exceptions import RequestException as RateLimitExceededError
+
 
 logger = logging.getLogger(__name__)
 
+try:  # HTTP/2 needs the optional ``h2`` package (``pip install httpx[http2]``)
+    import h2  # noqa: F401
+
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+
+def create_http_request() -> Request:
+    """Create the HTTP transport shared by atproto clients.
+
+    atproto already sends requests through a pooled ``httpx.Client``; this
+    raises the keep-alive limits and enables HTTP/2 multiplexing when ``h2``
+    is installed, so repeated timeline/profile calls reuse one connection.
+    """
+    return Request(
+        http2=_HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_keepalive_connections=64, max_connections=128),
+    )
+
+
+class _SessionLockedClient(Client):
+    """atproto ``Client`` whose session refresh is safe across threads.
+
+    fetch_many's workers share one client. Without the lock, workers that
+    see an expiring token together would each refresh it, each spending the
+    single-use refresh token and each rewriting the cached session file.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._session_refresh_lock = threading.Lock()
+
+    def _refresh_and_set_session(self) -> Any:
+        stale_jwt = self._session.access_jwt if self._session else None
+        with self._session_refresh_lock:
+            # Another worker refreshed the token while this one waited
+            session = self._session
+            if session is not None and session.access_jwt != stale_jwt:
+                return None
+            return super()._refresh_and_set_session()
+
 
 class BlueSkyClient:
     """Client for interacting with Bluesky's AT Protocol API."""
 
-    def __init__(self, handle: str, password: str):
-        """Initialize the Bluesky client with user credentials."""
+    def __init__(self, handle: str, password: str, session_path: Optional[str] = None):
+        """Initialize the Bluesky client with user credentials.
+
+        Args:
+            handle: Bluesky handle
+            password: Bluesky app password
+            session_path: Optional file used to reuse the login session across
+                runs instead of creating a new one every time
+        """
         self.handle = handle
         self.password = password
-        self.client = Client()
+        self.session_path = os.path.expanduser(session_path) if session_path else None
+        self.client = _SessionLockedClient(request=create_http_request())
+        if self.session_path:
+            self.client.on_session_change(self._on_session_change)
         self._authenticated = False
 
-    @retry(
-        attempts=config.app.api_retry_attempts,
-        base_delay=config.app.api_retry_base_delay,
-    )
     def authenticate(self) -> bool:
-        """Authenticate with Bluesky API."""
+        """Authenticate with Bluesky API, resuming a cached session if possible."""
         try:
-            self.client.login(self.handle, self.password)
+            if not self._resume_session():
+                self._login()
             self._authenticated = True
             logger.info(f"Successfully authenticated as {self.handle}")
             return True
@@ -41,9 +104,53 @@ class BlueSkyClient:
             return False
 
     @retry(
+        exceptions=(RateLimitExceededError,),
         attempts=config.app.api_retry_attempts,
         base_delay=config.app.api_retry_base_delay,
     )
+    def _login(self) -> None:
+        """Log in, waiting out rate limits (other failures are not retried)."""
+        self.client.login(self.handle, self.password)
+
+    def _resume_session(self) -> bool:
+        """Log in with the cached session; atproto refreshes stale tokens itself."""
+        session_string = self._load_session()
+        if not session_string:
+            return False
+        try:
+            self.client.login(session_string=session_string)
+            return True
+        except Exception as e:
+            logger.info(f"Cached session rejected, logging in again: {e}")
+            return False
+
+    def _load_session(self) -> Optional[str]:
+        if not self.session_path:
+            return None
+        try:
+            with open(self.session_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("handle") != self.handle:
+            return None
+        return data.get("session")
+
+    def _on_session_change(self, event: SessionEvent, session: Any) -> None:
+        """Persist newly created or refreshed sessions (owner-only permissions)."""
+        if event not in (SessionEvent.CREATE, SessionEvent.REFRESH):
+            return
+        try:
+            os.makedirs(os.path.dirname(self.session_path) or ".", exist_ok=True)
+            fd = os.open(
+                self.session_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600
+            )
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"handle": self.handle, "session": session.encode()}, f)
+            os.chmod(self.session_path, 0o600)
+        except OSError as e:
+            logger.warning(f"Could not cache Bluesky session: {e}")
+
     def fetch_timeline_posts(
         self, start_date: datetime, end_date: datetime, limit: int = 100
     ) -> List[Post]:
@@ -68,21 +175,139 @@ class BlueSkyClient:
         if end_date.tzinfo is None:
             end_date = end_date.replace(tzinfo=timezone.utc)
 
-        posts = []
-        cursor = None
+        try:
+            posts = self._collect_feed(
+                self._get_timeline_page, start_date, end_date, limit
+            )
+        except Exception as e:
+            logger.error(f"Error fetching timeline posts: {e}")
+            raise
+
+        logger.info(f"Fetched {len(posts)} posts from {start_date} to {end_date}")
+        return posts
+
+    def fetch_author_posts(
+        self, author: str, start_date: datetime, end_date: datetime, limit: int = 100
+    ) -> List[Post]:
+        """
+        Fetch one author's posts within a specific date range.
+
+        Args:
+            author: Author handle or DID
+            start_date: Start of the date range
+            end_date: End of the date range
+            limit: Maximum number of posts to fetch per request
+
+        Returns:
+            List of Post objects
+        """
+        if not self._authenticated:
+            if not self.authenticate():
+                raise RuntimeError("Failed to authenticate with Bluesky API")
+
+        # Ensure start_date and end_date are timezone-aware (UTC)
+        if start_date.tzinfo is None:
+            start_date = start_date.replace(tzinfo=timezone.utc)
+        if end_date.tzinfo is None:
+            end_date = end_date.replace(tzinfo=timezone.utc)
 
         try:
-            while True:
-                # Fetch timeline
-                response = self.client.get_timeline(
-                    algorithm="reverse-chronological",
-                    limit=min(limit, 100),  # API limit is typically 100
-                    cursor=cursor,
+            posts = self._collect_feed(
+                partial(self._get_author_feed_page, author),
+                start_date,
+                end_date,
+                limit,
+            )
+        except Exception as e:
+            logger.error(f"Error fetching posts for {author}: {e}")
+            raise
+
+        logger.info(
+            f"Fetched {len(posts)} posts by {author} from {start_date} to {end_date}"
+        )
+        return posts
+
+    def fetch_many(
+        self,
+        user_handles: Iterable[str],
+        start_date: datetime,
+        end_date: datetime,
+        limit: int = 100,
+        max_workers: int = 16,
+    ) -> Dict[str, List[Post]]:
+        """
+        Backfill several authors' feeds concurrently.
+
+        Workers share this client's authenticated session (one login total).
+        The httpx transport is thread-safe and token refreshes are serialized
+        by the client, so only one worker refreshes an expiring session. The
+        requests are I/O-bound, so wall time drops roughly by the worker count.
+
+        Args:
+            user_handles: Author handles or DIDs to fetch
+            start_date: Start of the date range
+            end_date: End of the date range
+            limit: Maximum number of posts to fetch per request
+            max_workers: Upper bound on concurrent author fetches
+
+        Returns:
+            Mapping of handle to its list of Post objects
+        """
+        handles = list(dict.fromkeys(user_handles))
+        if not handles:
+            return {}
+        if not self._authenticated:
+            if not self.authenticate():
+                raise RuntimeError("Failed to authenticate with Bluesky API")
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(handles))) as pool:
+            futures = {
+                handle: pool.submit(
+                    self.fetch_author_posts, handle, start_date, end_date, limit
                 )
+                for handle in handles
+            }
+            return {handle: future.result() for handle, future in futures.items()}
+
+    def _collect_feed(
+        self,
+        fetch_page: Callable[[int, Optional[str]], Any],
+        start_date: datetime,
+        end_date: datetime,
+        limit: int,
+    ) -> List[Post]:
+        """Page through a newest-first feed, keeping posts in [start_date, end_date].
+
+        ``fetch_page(page_limit, cursor)`` must return a response with ``feed``
+        and ``cursor`` attributes. Posts are returned oldest first.
+        """
+        posts = []
+        page_limit = min(limit, 100)  # API limit is typically 100
+        indexed_at = datetime.now(timezone.utc)  # shared by the whole fetch
+
+        # Feeds are cursor-sequential, so the next page is requested
+        # in the background as soon as its cursor is known and overlaps
+        # with converting the current page.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = executor.submit(fetch_page, page_limit, None)
+
+            while pending is not None:
+                response = pending.result()
+                pending = None
 
                 if not response.feed:
                     break
 
+                if (
+                    response.cursor
+                    and len(posts) + len(response.feed) < limit * 10
+                    and self._parse_created_at(response.feed[-1].post)
+                    >= start_date
+                ):
+                    pending = executor.submit(
+                        fetch_page, page_limit, response.cursor
+                    )
+
                 batch_posts = []
                 oldest_post_date = None
 
@@ -90,9 +315,7 @@ class BlueSkyClient:
                     post = feed_item.post
 
                     # Parse the post creation date
-                    created_at = datetime.fromisoformat(
-                        post.record.created_at.replace("Z", "+00:00")
-                    )
+                    created_at = self._parse_created_at(post)
 
                     # Check if post is within our date range
                     if created_at < start_date:
@@ -102,7 +325,9 @@ class BlueSkyClient:
 
                     if created_at <= end_date:
                         # Convert to our Post model
-                        post_obj = self._convert_to_post_model(post, created_at)
+                        post_obj = self._convert_to_post_model(
+                            post, created_at, indexed_at
+                        )
                         batch_posts.append(post_obj)
 
                     oldest_post_date = created_at
@@ -113,64 +338,79 @@ class BlueSkyClient:
                 if oldest_post_date and oldest_post_date < start_date:
                     break
 
-                if not response.cursor:
-                    break
-
-                cursor = response.cursor
-
                 # Safety limit to avoid infinite loops
                 if len(posts) >= limit * 10:
                     logger.warning(f"Reached safety limit of {limit * 10} posts")
                     break
 
-        except Exception as e:
-            logger.error(f"Error fetching timeline posts: {e}")
-            raise
+            if pending is not None:
+                pending.cancel()
 
-        # Filter posts to exact date range and sort
-        filtered_posts = [
-            post for post in posts if start_date <= post.created_at <= end_date
-        ]
+        # The loop above already bounds posts to [start_date, end_date]. Pages
+        # arrive newest-first, so reversing gives nearly ascending order; the
+        # stable sort only fixes up reposts that are out of order (linear on
+        # already-sorted runs).
+        posts.reverse()
+        posts.sort(key=attrgetter("created_at"))
+        return posts
 
-        filtered_posts.sort(key=lambda p: p.created_at)
+    @retry(
+        attempts=config.app.api_retry_attempts,
+        base_delay=config.app.api_retry_base_delay,
+    )
+    def _get_author_feed_page(
+        self, author: str, page_limit: int, cursor: Optional[str]
+    ):
+        """Fetch a single page of an author's feed (newest first)."""
+        return self.client.get_author_feed(
+            actor=author, limit=page_limit, cursor=cursor
+        )
 
-        logger.info(
-            f"Fetched {len(filtered_posts)} posts from {start_date} to {end_date}"
+    @retry(
+        attempts=config.app.api_retry_attempts,
+        base_delay=config.app.api_retry_base_delay,
+    )
+    def _get_timeline_page(self, page_limit: int, cursor: Optional[str]):
+        """Fetch a single page of the reverse-chronological timeline.
+
+        Retried per page so a transient failure or rate limit does not
+        restart pagination from the first page.
+        """
+        return self.client.get_timeline(
+            algorithm="reverse-chronological",
+            limit=page_limit,
+            cursor=cursor,
         )
-        return filtered_posts
+
+    @staticmethod
+    def _parse_created_at(atproto_post: models.AppBskyFeedDefs.PostView) -> datetime:
+        """Parse a post's record creation time as a UTC-aware datetime."""
+        return parse_atproto_timestamp(atproto_post.record.created_at)
 
     def _convert_to_post_model(
         self,
         atproto_post: models.AppBskyFeedDefs.PostView,
         created_at: datetime,
+        indexed_at: Optional[datetime] = None,
     ) -> Post:
-        """Convert AT Protocol post to our Post model."""
-
-        # Get engagement metrics
-        like_count = atproto_post.like_count or 0
-        repost_count = atproto_post.repost_count or 0
-        reply_count = atproto_post.reply_count or 0
+        """Convert AT Protocol post to our Post model.
 
-        # Get author information
+        ``indexed_at`` defaults to now; batch callers pass a single shared value.
+        """
         author = atproto_post.author
-        author_handle = author.handle
-        author_did = author.did
-
-        # Get post content
-        text = atproto_post.record.text if hasattr(atproto_post.record, "text") else ""
 
         return Post(
             id=None,  # Will be set by database
             uri=atproto_post.uri,
             cid=atproto_post.cid,
-            author_handle=author_handle,
-            author_did=author_did,
-            text=text,
+            author_handle=author.handle,
+            author_did=author.did,
+            text=getattr(atproto_post.record, "text", ""),
             created_at=created_at,
-            like_count=like_count,
-            repost_count=repost_count,
-            reply_count=reply_count,
-            indexed_at=datetime.now(timezone.utc),
+            like_count=atproto_post.like_count or 0,
+            repost_count=atproto_post.repost_count or 0,
+            reply_count=atproto_post.reply_count or 0,
+            indexed_at=indexed_at or datetime.now(timezone.utc),
         )
 
     def get_user_profile(self, handle: Optional[str] = None) -> Optional[dict]:
@@ -180,7 +420,7 @@ class BlueSkyClient:
                 return None
 
         try:
-            profile = self.client.get_profile(handle or self.handle)
+            profile = self._get_profile(handle or self.handle)
             return {
                 "handle": profile.handle,
                 "display_name": profile.display_name,
@@ -192,3 +432,12 @@ class BlueSkyClient:
         except Exception as e:
             logger.error(f"Error fetching profile: {e}")
             return None
+
+    @retry(
+        exceptions=(RateLimitExceededError,),
+        attempts=config.app.api_retry_attempts,
+        base_delay=config.app.api_retry_base_delay,
+    )
+    def _get_profile(self, handle: str):
+        """Fetch a profile, waiting out rate limits."""
+        return self.client.get_profile(handle)
@@ -4,20 +4,19 @@ Command Line Interface for the Bluesky Feed Summarizer.
 
 import logging
 import sys
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from itertools import chain, islice
+from typing import Iterable, Iterator, Optional, Tuple
 
 import click
-from rich.console import Console
+from rich.console import Console, Group
 from rich.table import Table
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.text import Text
 
 from .config import config
 from .utils.dates import resolve_date_range
-from .database import DatabaseManager
-from .bluesky import BlueSkyClient
-from .ai import ClaudeSummarizer
+from .database import DatabaseManager, Post, Summary
 
 
 # Setup logging
@@ -29,11 +28,66 @@ logger = logging.getLogger(__name__)
 # Rich console for beautiful output
 console = Console()
 
+# Number of post panels rendered per console.print call in the posts command
+_POSTS_RENDER_CHUNK = 64
+
+
+def _open_database(db_path: str) -> DatabaseManager:
+    """Open a database manager that is closed when the CLI command ends."""
+    db_manager = DatabaseManager(
+        db_path,
+        cache_size_kib=config.database.cache_size_kib,
+        mmap_size=config.database.mmap_size,
+    )
+    ctx = click.get_current_context(silent=True)
+    if ctx is not None:
+        ctx.call_on_close(db_manager.close)
+    return db_manager
+
+
+def _plan_fetch_window(
+    start_date: datetime,
+    end_date: datetime,
+    coverage: Optional[Tuple[datetime, datetime]],
+) -> Optional[Tuple[datetime, datetime]]:
+    """Return the part of [start_date, end_date] that still needs fetching.
+
+    The timeline can only be paged newest-first, so only a window whose
+    older edge is already covered can be narrowed to the newer gap.
+    Returns None when the whole window is already covered.
+    """
+    if coverage is None:
+        return start_date, end_date
+    covered_start, covered_end = coverage
+    if covered_start <= start_date and end_date <= covered_end:
+        return None
+    if covered_start <= start_date <= covered_end:
+        return covered_end, end_date
+    return start_date, end_date
+
+
+def _merge_coverage(
+    fetched: Tuple[datetime, datetime],
+    coverage: Optional[Tuple[datetime, datetime]],
+) -> Tuple[datetime, datetime]:
+    """Union the fetched window with existing coverage when they touch."""
+    if coverage is None or fetched[0] > coverage[1] or fetched[1] < coverage[0]:
+        return fetched
+    return min(fetched[0], coverage[0]), max(fetched[1], coverage[1])
+
 
 def _fetch_posts_logic(
-    start_date: datetime, end_date: datetime, limit: Optional[int] = None
+    start_date: datetime,
+    end_date: datetime,
+    limit: Optional[int] = None,
+    force_refresh: bool = False,
+    db_manager: Optional[DatabaseManager] = None,
 ) -> int:
     """Core logic for fetching posts. Returns number of saved posts."""
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
+    from .bluesky import BlueSkyClient
+
     fetch_limit = limit or config.app.max_posts_per_fetch
 
     console.print(
@@ -41,8 +95,25 @@ def _fetch_posts_logic(
     )
 
     # Initialize components
-    db_manager = DatabaseManager(config.database.path)
-    bluesky_client = BlueSkyClient(config.bluesky.handle, config.bluesky.password)
+    if db_manager is None:
+        db_manager = _open_database(config.database.path)
+
+    # Only hit the network for the part of the window not fetched before
+    coverage = None if force_refresh else db_manager.get_fetch_coverage()
+    window = _plan_fetch_window(start_date, end_date, coverage)
+    if window is None:
+        console.print(
+            "[green]All posts in this range were already fetched "
+            "(use --force-refresh to re-fetch).[/green]"
+        )
+        return 0
+    fetch_start, fetch_end = window
+
+    bluesky_client = BlueSkyClient(
+        config.bluesky.handle,
+        config.bluesky.password,
+        session_path=config.bluesky.session_path,
+    )
 
     with Progress(
         SpinnerColumn(),
@@ -58,7 +129,7 @@ def _fetch_posts_logic(
 
         # Fetch posts
         progress.update(task, description="Fetching timeline posts...")
-        posts = bluesky_client.fetch_timeline_posts(start_date, end_date, fetch_limit)
+        posts = bluesky_client.fetch_timeline_posts(fetch_start, fetch_end, fetch_limit)
         progress.update(task, description=f"Fetched {len(posts)} posts ✓")
 
         # Save to database
@@ -68,6 +139,9 @@ def _fetch_posts_logic(
             task,
             description=f"Saved {save_result['new']} new posts, updated {save_result['updated']} existing ✓",
         )
+        # A fetch cut short by the client's safety limit may not reach fetch_start
+        if len(posts) < fetch_limit * 10:
+            db_manager.set_fetch_coverage(*_merge_coverage(window, coverage))
 
     # Display results
     table = Table(title="Fetch Results")
@@ -75,6 +149,11 @@ def _fetch_posts_logic(
     table.add_column("Value", style="green")
 
     table.add_row("Date Range", f"{start_date.date()} to {end_date.date()}")
+    if window != (start_date, end_date):
+        table.add_row(
+            "Fetched Window",
+            f"{fetch_start:%Y-%m-%d %H:%M:%S} to {fetch_end:%Y-%m-%d %H:%M:%S}",
+        )
     table.add_row("Posts Fetched", str(len(posts)))
     table.add_row("New Posts Saved", str(save_result["new"]))
     table.add_row("Existing Posts Updated", str(save_result["updated"]))
@@ -86,35 +165,59 @@ def _fetch_posts_logic(
 
 
 def _summarize_posts_logic(
-    start_date: datetime, end_date: datetime, model: str, save: bool = True
+    start_date: datetime,
+    end_date: datetime,
+    model: str,
+    save: bool = True,
+    db_manager: Optional[DatabaseManager] = None,
+    refresh: bool = False,
 ) -> str:
-    """Core logic for summarizing posts. Returns summary text."""
+    """Core logic for summarizing posts. Returns summary text.
+
+    A saved summary for the same range and model is reused unless ``refresh``
+    is set or posts in the range were fetched after it was generated.
+    """
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
+    from .ai import ClaudeSummarizer
+
     console.print(
         f"[blue]Generating summary for {start_date.date()} to {end_date.date()}[/blue]"
     )
 
     # Initialize components
-    db_manager = DatabaseManager(config.database.path)
+    if db_manager is None:
+        db_manager = _open_database(config.database.path)
+
+    if not refresh:
+        cached = db_manager.get_summary_by_range(start_date, end_date, model)
+        if cached:
+            console.print(
+                f"Reusing summary from {cached.created_at:%Y-%m-%d %H:%M:%S} "
+                "(use --refresh to regenerate) ✓"
+            )
+            _print_summary_panel(cached, model, cached.post_count)
+            return cached.summary_text
+
     summarizer = ClaudeSummarizer(config.anthropic.api_key, model)
 
+    # Loading from the local database is fast; no spinner needed
+    posts = db_manager.get_posts_by_date_range(start_date, end_date)
+    console.print(f"Loaded {len(posts)} posts ✓")
+
+    if not posts:
+        console.print("[yellow]No posts found in the specified date range.[/yellow]")
+        return "No posts found in the specified date range."
+
+    # The spinner only covers the slow API call (and the save after it)
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         console=console,
+        refresh_per_second=4,
     ) as progress:
-        # Get posts from database
-        task = progress.add_task("Loading posts from database...", total=None)
-        posts = db_manager.get_posts_by_date_range(start_date, end_date)
-        progress.update(task, description=f"Loaded {len(posts)} posts ✓")
-
-        if not posts:
-            console.print(
-                "[yellow]No posts found in the specified date range.[/yellow]"
-            )
-            return "No posts found in the specified date range."
-
         # Generate summary
-        progress.update(task, description="Generating AI summary...")
+        task = progress.add_task("Generating AI summary...", total=None)
         summary = summarizer.summarize_posts(posts, start_date, end_date)
         progress.update(task, description="Summary generated ✓")
 
@@ -124,15 +227,51 @@ def _summarize_posts_logic(
             summary_id = db_manager.save_summary(summary)
             progress.update(task, description=f"Summary saved (ID: {summary_id}) ✓")
 
-    # Display summary
+    _print_summary_panel(summary, model, len(posts))
+    return summary.summary_text
+
+
+def _post_panel(i: int, post: Post) -> Panel:
+    """Build the display panel for the ``i``-th post (1-based)."""
+    engagement = f"❤️ {post.like_count} | 🔄 {post.repost_count} | 💬 {post.reply_count}"
+    timestamp = post.created_at.strftime("%Y-%m-%d %H:%M:%S UTC")
+
+    # Styled Text bypasses the markup parser (and keeps "[...]" in post text
+    # from being read as markup)
+    return Panel(
+        Text.assemble((post.text, "bold"), "\n\n", (engagement, "dim")),
+        title=Text(f"#{i} • @{post.author_handle} • {timestamp}"),
+        subtitle=Text(f"URI: {post.uri}"),
+        border_style="blue" if i % 2 == 1 else "green",
+        expand=False,
+    )
+
+
+def _render_post_chunks(
+    posts: Iterable[Post], size: int = _POSTS_RENDER_CHUNK
+) -> Iterator[Group]:
+    """Yield post panels grouped ``size`` at a time, building them lazily."""
+    panels = []
+    for i, post in enumerate(posts, 1):
+        panels.append(_post_panel(i, post))
+        if len(panels) == size:
+            yield Group(*panels)
+            panels = []
+    if panels:
+        yield Group(*panels)
+
+
+def _print_summary_panel(summary: Summary, model: str, post_count: int) -> None:
     panel = Panel(
         summary.summary_text,
-        title=f"📝 Feed Summary ({start_date.date()} to {end_date.date()})",
-        subtitle=f"Generated with {model} • {len(posts)} posts analyzed",
+        title=(
+            f"📝 Feed Summary ({summary.start_date.date()} to "
+            f"{summary.end_date.date()})"
+        ),
+        subtitle=f"Generated with {model} • {post_count} posts analyzed",
         border_style="blue",
     )
     console.print(panel)
-    return summary.summary_text
 
 
 @click.group()
@@ -162,8 +301,8 @@ def prune(older_than_days: int, vacuum: bool):
         if older_than_days <= 0:
             raise click.BadParameter("older-than-days must be positive")
 
-        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
-        db_manager = DatabaseManager(config.database.path)
+        cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+        db_manager = _open_database(config.database.path)
         deleted = db_manager.prune_posts_older_than(cutoff)
         after_count = db_manager.get_total_post_count()
 
@@ -210,11 +349,17 @@ def prune(older_than_days: int, vacuum: bool):
     type=int,
     help="Maximum number of posts to fetch per request",
 )
+@click.option(
+    "--force-refresh",
+    is_flag=True,
+    help="Re-fetch the whole range even if it was fetched before",
+)
 def fetch(
     days: Optional[int],
     start_date: Optional[datetime],
     end_date: Optional[datetime],
     limit: Optional[int],
+    force_refresh: bool,
 ):
     """Fetch posts from Bluesky timeline and save to database."""
 
@@ -225,7 +370,7 @@ def fetch(
             days=days,
             default_days_back=config.app.default_days_back,
         )
-        _fetch_posts_logic(fetch_start, fetch_end, limit)
+        _fetch_posts_logic(fetch_start, fetch_end, limit, force_refresh)
 
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
@@ -256,12 +401,18 @@ def fetch(
 @click.option(
     "--save/--no-save", default=True, help="Save summary to database (default: True)"
 )
+@click.option(
+    "--refresh",
+    is_flag=True,
+    help="Regenerate even if a summary for this range and model is saved",
+)
 def summarize(
     days: Optional[int],
     start_date: Optional[datetime],
     end_date: Optional[datetime],
     model: str,
     save: bool,
+    refresh: bool,
 ):
     """Generate AI summary of posts in the database."""
 
@@ -272,7 +423,7 @@ def summarize(
             days=days,
             default_days_back=config.app.default_days_back,
         )
-        _summarize_posts_logic(summary_start, summary_end, model, save)
+        _summarize_posts_logic(summary_start, summary_end, model, save, refresh=refresh)
 
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
@@ -307,12 +458,18 @@ def summarize(
     default="claude-3-7-sonnet-latest",
     help="Claude model to use for summarization",
 )
+@click.option(
+    "--force-refresh",
+    is_flag=True,
+    help="Re-fetch the whole range and regenerate its summary",
+)
 def run(
     days: Optional[int],
     start_date: Optional[datetime],
     end_date: Optional[datetime],
     limit: Optional[int],
     model: str,
+    force_refresh: bool,
 ):
     """Fetch posts and generate summary in one command."""
 
@@ -328,13 +485,25 @@ def run(
             default_days_back=config.app.default_days_back,
         )
 
+        # Both steps share one database manager
+        db_manager = _open_database(config.database.path)
+
         # Run fetch
         console.print("\n[bold]Step 1: Fetching posts[/bold]")
-        _fetch_posts_logic(process_start, process_end, limit)
+        _fetch_posts_logic(
+            process_start, process_end, limit, force_refresh, db_manager=db_manager
+        )
 
         # Run summarize
         console.print("\n[bold]Step 2: Generating summary[/bold]")
-        _summarize_posts_logic(process_start, process_end, model, save=True)
+        _summarize_posts_logic(
+            process_start,
+            process_end,
+            model,
+            save=True,
+            db_manager=db_manager,
+            refresh=force_refresh,
+        )
 
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
@@ -350,7 +519,7 @@ def history(limit: int):
     """Show recent summaries from the database."""
 
     try:
-        db_manager = DatabaseManager(config.database.path)
+        db_manager = _open_database(config.database.path)
 
         # This would need to be implemented in DatabaseManager
         # For now, just show the latest summary
@@ -397,12 +566,18 @@ def history(limit: int):
     default=None,
     help="Filter by author handle (e.g., user.bsky.social)",
 )
+@click.option(
+    "--show-total",
+    is_flag=True,
+    help="Count all matching posts (runs an extra COUNT query)",
+)
 def posts(
     days: Optional[int],
     start_date: Optional[datetime],
     end_date: Optional[datetime],
     limit: int,
     author: Optional[str],
+    show_total: bool,
 ):
     """Display saved posts from the database in chronological order."""
 
@@ -419,39 +594,30 @@ def posts(
         )
 
         # Initialize database manager
-        db_manager = DatabaseManager(config.database.path)
-
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
-            task = progress.add_task("Loading posts from database...", total=None)
-
-            # Get posts from database
-            all_posts = db_manager.get_posts_by_date_range(query_start, query_end)
-
-            # Filter by author if specified
+        db_manager = _open_database(config.database.path)
+
+        # The exact total costs a COUNT(*) query, so it is opt-in; truncation
+        # is detected by asking for one row more than will be shown
+        total_posts = None
+        if show_total:
+            total_posts = db_manager.count_posts_by_date_range(
+                query_start, query_end, author_substr=author
+            )
             if author:
-                all_posts = [
-                    post
-                    for post in all_posts
-                    if author.lower() in post.author_handle.lower()
-                ]
-                progress.update(
-                    task,
-                    description=f"Filtered {len(all_posts)} posts by author '{author}' ✓",
-                )
+                console.print(f"Filtered {total_posts} posts by author '{author}' ✓")
             else:
-                progress.update(task, description=f"Loaded {len(all_posts)} posts ✓")
-
-            # Sort posts chronologically (oldest first)
-            sorted_posts = sorted(all_posts, key=lambda p: p.created_at)
-
-            # Apply limit
-            display_posts = sorted_posts[:limit] if limit > 0 else sorted_posts
-
-        if not display_posts:
+                console.print(f"Found {total_posts} posts ✓")
+
+        # Posts are streamed from SQL while rendering
+        display_posts = db_manager.iter_posts_by_date_range(
+            query_start,
+            query_end,
+            author_substr=author,
+            limit=limit + 1 if limit > 0 else None,
+            chunk_size=_POSTS_RENDER_CHUNK,
+        )
+        first_post = next(display_posts, None)
+        if first_post is None:
             console.print("[yellow]No posts found in the specified criteria.[/yellow]")
             return
 
@@ -463,38 +629,34 @@ def posts(
         summary_table.add_row(
             "Date Range", f"{query_start.date()} to {query_end.date()}"
         )
-        summary_table.add_row("Total Posts Found", str(len(all_posts)))
-        summary_table.add_row("Posts Displayed", str(len(display_posts)))
+        if total_posts is not None:
+            display_count = min(total_posts, limit) if limit > 0 else total_posts
+            summary_table.add_row("Total Posts Found", str(total_posts))
+            summary_table.add_row("Posts Displayed", str(display_count))
         if author:
             summary_table.add_row("Author Filter", author)
 
         console.print(summary_table)
         console.print()
 
-        # Display posts
-        for i, post in enumerate(display_posts, 1):
-            # Create engagement info
-            engagement = (
-                f"❤️ {post.like_count} | 🔄 {post.repost_count} | 💬 {post.reply_count}"
-            )
-
-            # Format timestamp
-            timestamp = post.created_at.strftime("%Y-%m-%d %H:%M:%S UTC")
-
-            # Create post panel
-            panel = Panel(
-                f"[bold]{post.text}[/bold]\n\n[dim]{engagement}[/dim]",
-                title=f"#{i} • @{post.author_handle} • {timestamp}",
-                subtitle=f"URI: {post.uri}",
-                border_style="blue" if i % 2 == 1 else "green",
-                expand=False,
-            )
-            console.print(panel)
+        # Render panels in chunks with one print call each, so memory stays
+        # bounded and output starts before every row has been read
+        shown_posts = chain([first_post], display_posts)
+        if limit > 0:
+            shown_posts = islice(shown_posts, limit)
+        shown = 0
+        for group in _render_post_chunks(shown_posts):
+            console.print(group)
+            shown += len(group.renderables)
+        # The query asked for one extra row; if it is there, output was cut off
+        truncated = limit > 0 and next(display_posts, None) is not None
 
         # Show pagination info if limited
-        if len(all_posts) > limit:
+        if truncated:
+            of_total = f"of {total_posts} " if total_posts is not None else ""
+            more = "" if total_posts is not None else " (more available)"
             console.print(
-                f"\n[yellow]Showing {len(display_posts)} of {len(all_posts)} posts. "
+                f"\n[yellow]Showing {shown} {of_total}posts{more}. "
                 f"Use --limit to show more.[/yellow]"
             )
 
@@ -512,7 +674,8 @@ def status():
     table.add_column("Setting", style="cyan")
     table.add_column("Value", style="green")
 
-    # Try to load config, but handle missing environment variables gracefully
+    # Config sections load independently; the Bluesky credentials are
+    # required, and the database and app settings may fail to parse
     try:
         bluesky_handle = config.bluesky.handle
     except ValueError:
@@ -535,16 +698,22 @@ def status():
     table.add_row("Default Days Back", default_days)
     table.add_row("Max Posts Per Fetch", max_posts)
 
-    # Check if database exists
+    # Check if database exists (one stat call gives existence and size)
     import os
 
-    db_exists = os.path.exists(db_path)
+    try:
+        db_size = os.stat(db_path).st_size
+        db_exists = True
+    except FileNotFoundError:
+        db_exists = False
     table.add_row("Database Exists", "✓ Yes" if db_exists else "✗ No")
 
     if db_exists:
+        table.add_row("Database Size (KB)", f"{db_size / 1024:.1f}")
         try:
-            db_manager = DatabaseManager(db_path)
-            latest_summary = db_manager.get_latest_summary()
+            db_manager = _open_database(db_path)
+            bundle = db_manager.get_status_bundle()
+            latest_summary = bundle["latest_summary"]
             if latest_summary:
                 table.add_row(
                     "Latest Summary",
@@ -553,9 +722,7 @@ def status():
             else:
                 table.add_row("Latest Summary", "None")
 
-            # Get total post count
-            total_posts = db_manager.get_total_post_count()
-            table.add_row("Total Posts", str(total_posts))
+            table.add_row("Total Posts", str(bundle["total_posts"]))
 
         except Exception:
             table.add_row("Latest Summary", "Error reading database")
@@ -630,73 +797,55 @@ def stream(poll_interval: int, users: tuple, keywords: tuple, stats_interval: in
             keywords=keyword_set,
             poll_interval=poll_interval,
         ) as service:
+            # Authenticates here (errors surface in this thread), then returns
+            # once the polling worker thread is running
+            service.start(block=False)
             console.print(
                 "[green]✅ Streaming service started! Press Ctrl+C to stop.[/green]"
             )
             console.print()
 
-            # Start the service in a background thread
-            import threading
-            import time
-
-            service_thread = threading.Thread(target=service.start, daemon=True)
-            service_thread.start()
-
-            # Wait a moment for service to start
-            time.sleep(2)
-
-            # Display stats periodically
-            last_stats_time = time.time()
-
+            # Display stats every interval; wait() returns early once stopped
             try:
-                while service.is_running:
-                    current_time = time.time()
-
-                    # Display stats at interval
-                    if current_time - last_stats_time >= stats_interval:
-                        stats = service.get_stats()
-
-                        stats_table = Table(title="Streaming Statistics")
-                        stats_table.add_column("Metric", style="cyan")
-                        stats_table.add_column("Value", style="green")
-
-                        stats_table.add_row(
-                            "Status",
-                            "🟢 Running" if stats["is_running"] else "🔴 Stopped",
-                        )
-
-                        if stats["runtime_seconds"]:
-                            runtime_str = f"{stats['runtime_seconds']:.1f} seconds"
-                            if stats["runtime_seconds"] > 60:
-                                minutes = stats["runtime_seconds"] // 60
-                                seconds = stats["runtime_seconds"] % 60
-                                runtime_str = f"{minutes:.0f}m {seconds:.0f}s"
-                        else:
-                            runtime_str = "N/A"
-
-                        stats_table.add_row("Runtime", runtime_str)
-                        stats_table.add_row(
-                            "Posts Processed", str(stats["posts_processed"])
-                        )
-                        stats_table.add_row("Posts Saved", str(stats["posts_saved"]))
-                        stats_table.add_row(
-                            "Processing Rate",
-                            f"{stats['posts_per_minute']:.1f} posts/min",
-                        )
-
-                        if stats["last_check"]:
-                            last_check_str = stats["last_check"].strftime("%H:%M:%S")
-                        else:
-                            last_check_str = "Never"
-
-                        stats_table.add_row("Last Check", last_check_str)
-
-                        console.print(stats_table)
-                        console.print()
-
-                        last_stats_time = current_time
-
-                    time.sleep(1)
+                while not service.wait(stats_interval):
+                    stats = service.get_stats()
+
+                    stats_table = Table(title="Streaming Statistics")
+                    stats_table.add_column("Metric", style="cyan")
+                    stats_table.add_column("Value", style="green")
+
+                    stats_table.add_row(
+                        "Status",
+                        "🟢 Running" if stats["is_running"] else "🔴 Stopped",
+                    )
+
+                    if stats["runtime_seconds"]:
+                        runtime_str = f"{stats['runtime_seconds']:.1f} seconds"
+                        if stats["runtime_seconds"] > 60:
+                            minutes = stats["runtime_seconds"] // 60
+                            seconds = stats["runtime_seconds"] % 60
+                            runtime_str = f"{minutes:.0f}m {seconds:.0f}s"
+                    else:
+                        runtime_str = "N/A"
+
+                    stats_table.add_row("Runtime", runtime_str)
+                    stats_table.add_row(
+                        "Posts Processed", str(stats["posts_processed"])
+                    )
+                    stats_table.add_row("Posts Saved", str(stats["posts_saved"]))
+                    stats_table.add_row(
+                        "Processing Rate",
+                        f"{stats['posts_per_minute']:.1f} posts/min",
+                    )
+
+                    if stats["last_check"]:
+                        last_check_str = stats["last_check"].strftime("%H:%M:%S")
+                    else:
+                        last_check_str = "Never"
+
+                    stats_table.add_row("Last Check", last_check_str)
+
+                    console.print(stats_table, end="\n\n")
 
             except KeyboardInterrupt:
                 console.print(
@@ -704,9 +853,6 @@ def stream(poll_interval: int, users: tuple, keywords: tuple, stats_interval: in
                 )
                 service.stop()
 
-            # Wait for service thread to finish
-            service_thread.join(timeout=10)
-
             # Display final stats
             final_stats = service.get_stats()
 
@@ -742,9 +888,10 @@ def stream(poll_interval: int, users: tuple, keywords: tuple, stats_interval: in
 @cli.command()
 def verify():
     """Verify database integrity and check for duplicate posts."""
+    from rich.progress import Progress, SpinnerColumn, TextColumn
 
     try:
-        db_manager = DatabaseManager(config.database.path)
+        db_manager = _open_database(config.database.path)
 
         console.print("[blue]🔍 Verifying database integrity...[/blue]")
 
@@ -755,13 +902,16 @@ def verify():
         ) as progress:
             task = progress.add_task("Analyzing database...", total=None)
 
-            # Get total post count
-            total_posts = db_manager.get_total_post_count()
-            progress.update(task, description=f"Found {total_posts} total posts ✓")
-
-            # Check for URI uniqueness (should be enforced by database constraint)
-            unique_uris = db_manager.get_unique_uri_count()
-            progress.update(task, description=f"Verified {unique_uris} unique URIs ✓")
+            # All integrity counts come from a single aggregate query
+            stats = db_manager.get_verification_stats()
+            total_posts = stats["total_posts"]
+            # URI uniqueness should also be enforced by the database constraint
+            unique_uris = stats["unique_uris"]
+            duplicate_content = stats["duplicate_content"]
+            progress.update(
+                task,
+                description=f"Found {total_posts} posts, {unique_uris} unique URIs ✓",
+            )
 
         # Display results
         verification_table = Table(title="Database Verification Results")
@@ -781,8 +931,7 @@ def verify():
                 f"⚠️ Found {total_posts - unique_uris} potential duplicates",
             )
 
-        # Check for posts with same content but different URIs
-        duplicate_content = db_manager.get_duplicate_content_count()
+        # Posts with same content but different URIs
         verification_table.add_row(
             "Duplicate Content",
             f"Found {duplicate_content} posts with duplicate text"
@@ -3,74 +3,98 @@ Configuration management for the Bluesky Feed Summarizer.
 """
 
 import os
-from pydantic import BaseModel, Field
+from dataclasses import dataclass
+from functools import cached_property
+
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
 
-class BlueskyConfig(BaseModel):
+@dataclass(frozen=True)
+class BlueskyConfig:
     """Configuration for Bluesky API."""
 
-    handle: str = Field(..., description="Bluesky handle (e.g., user.bsky.social)")
-    password: str = Field(..., description="Bluesky app password")
+    handle: str  # Bluesky handle (e.g., user.bsky.social)
+    password: str  # Bluesky app password
+    # File caching the login session between runs (empty disables)
+    session_path: str = "~/.cache/bluesky_summarizer/session.json"
 
 
-class AnthropicConfig(BaseModel):
+@dataclass(frozen=True)
+class AnthropicConfig:
     """Configuration for Anthropic Claude API."""
 
-    api_key: str = Field(..., description="Anthropic API key")
+    api_key: str
 
 
-class DatabaseConfig(BaseModel):
+@dataclass(frozen=True)
+class DatabaseConfig:
     """Configuration for SQLite database."""
 
-    path: str = Field(
-        default="./data/bluesky_feed.db", description="Path to SQLite database file"
-    )
+    path: str = "./data/bluesky_feed.db"
+    # Page cache per connection, in KiB
+    cache_size_kib: int = 65536
+    # Bytes of the database file to memory-map (0 disables mmap)
+    mmap_size: int = 268435456
 
 
-class AppConfig(BaseModel):
+@dataclass(frozen=True)
+class AppConfig:
     """Main application configuration."""
 
-    default_days_back: int = Field(
-        default=1, description="Default number of days to look back for posts"
-    )
-    max_posts_per_fetch: int = Field(
-        default=100, description="Maximum number of posts to fetch per request"
-    )
-    max_prompt_chars: int = Field(
-        default=20000,
-        description="Hard cap on characters included in a single summarization prompt (prevents token overflow)",
-    )
-    api_retry_attempts: int = Field(
-        default=3, description="Number of retry attempts for external API calls"
-    )
-    api_retry_base_delay: float = Field(
-        default=0.5, description="Base delay (seconds) for external API retry backoff"
-    )
+    # Default number of days to look back for posts
+    default_days_back: int = 1
+    # Maximum number of posts to fetch per request
+    max_posts_per_fetch: int = 100
+    # Estimated input-token budget for the posts in a single summarization
+    # prompt; this is the limit that normally applies
+    max_prompt_tokens: int = 4000
+    # Hard character cap on the same posts, a backstop for the token estimate
+    max_prompt_chars: int = 20000
+    # Number of retry attempts for external API calls
+    api_retry_attempts: int = 3
+    # Base delay (seconds) for external API retry backoff
+    api_retry_base_delay: float = 0.5
 
 
 class Config:
-    """Main configuration class that loads all settings."""
+    """Main configuration class that loads all settings.
+
+    Each section is built (and its environment variables validated) on first
+    access, so commands only need the variables for the sections they use.
+    """
 
-    def __init__(self):
-        self.bluesky = BlueskyConfig(
+    @cached_property
+    def bluesky(self) -> BlueskyConfig:
+        return BlueskyConfig(
             handle=self._get_env_var("BLUESKY_HANDLE"),
             password=self._get_env_var("BLUESKY_PASSWORD"),
+            session_path=os.getenv(
+                "BLUESKY_SESSION_PATH", "~/.cache/bluesky_summarizer/session.json"
+            ),
         )
 
-        self.anthropic = AnthropicConfig(api_key=self._get_env_var("ANTHROPIC_API_KEY"))
+    @cached_property
+    def anthropic(self) -> AnthropicConfig:
+        return AnthropicConfig(api_key=self._get_env_var("ANTHROPIC_API_KEY"))
 
-        self.database = DatabaseConfig(
-            path=os.getenv("DATABASE_PATH", "./data/bluesky_feed.db")
+    @cached_property
+    def database(self) -> DatabaseConfig:
+        return DatabaseConfig(
+            path=os.getenv("DATABASE_PATH", "./data/bluesky_feed.db"),
+            cache_size_kib=self._get_int_env_var("DATABASE_CACHE_SIZE_KIB", 65536),
+            mmap_size=self._get_int_env_var("DATABASE_MMAP_SIZE", 268435456),
         )
 
-        self.app = AppConfig(
+    @cached_property
+    def app(self) -> AppConfig:
+        return AppConfig(
             default_days_back=int(os.getenv("DEFAULT_DAYS_BACK", "1")),
             max_posts_per_fetch=int(os.getenv("MAX_POSTS_PER_FETCH", "100")),
             max_prompt_chars=int(os.getenv("MAX_PROMPT_CHARS", "20000")),
+            max_prompt_tokens=int(os.getenv("MAX_PROMPT_TOKENS", "4000")),
             api_retry_attempts=int(os.getenv("API_RETRY_ATTEMPTS", "3")),
             api_retry_base_delay=float(os.getenv("API_RETRY_BASE_DELAY", "0.5")),
         )
@@ -82,21 +106,27 @@ class Config:
             raise ValueError(f"Environment variable {var_name} is required but not set")
         return value
 
+    def _get_int_env_var(self, var_name: str, default: int) -> int:
+        """Get a non-negative integer environment variable, or its default."""
+        value = os.getenv(var_name)
+        if value is None or not value.strip():
+            return default
+        try:
+            parsed = int(value)
+        except ValueError:
+            parsed = -1
+        if parsed < 0:
+            raise ValueError(
+                f"Environment variable {var_name} must be a non-negative integer, "
+                f"got {value!r}"
+            )
+        return parsed
+
 
 def get_config() -> Config:
     """Get the application configuration."""
     return Config()
 
 
-# For backwards compatibility, create a lazy config object
-class LazyConfig:
-    def __init__(self):
-        self._config = None
-
-    def __getattr__(self, name):
-        if self._config is None:
-            self._config = Config()
-        return getattr(self._config, name)
-
-
-config = LazyConfig()
+# Sections load on first access, so the shared instance is cheap to create
+config = Config()
@@ -4,5 +4,6 @@ Database operations for the Bluesky Feed Summarizer.
 
 from .models import Post, Summary
 from .operations import DatabaseManager
+from .async_operations import AsyncDatabaseManager
 
-__all__ = ["Post", "Summary", "DatabaseManager"]
+__all__ = ["Post", "Summary", "DatabaseManager", "AsyncDatabaseManager"]
@@ -0,0 +1,83 @@
+"""
+Asyncio-friendly access to the posts database.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, TypeVar
+
+from .models import Post
+from .operations import DatabaseManager
+
+T = TypeVar("T")
+
+
+class AsyncDatabaseManager:
+    """Awaitable wrapper around :class:`DatabaseManager` for event-loop callers.
+
+    Calls run on a small dedicated thread pool rather than the event loop.
+    DatabaseManager keeps one connection per thread, so each worker opens
+    (and configures) its connection once and reuses it, which behaves like a
+    fixed-size connection pool with warm page caches.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        pool_size: int = 4,
+        cache_size_kib: int = 65536,
+        mmap_size: int = 268435456,
+    ) -> None:
+        self._db = DatabaseManager(
+            db_path, cache_size_kib=cache_size_kib, mmap_size=mmap_size
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=pool_size, thread_name_prefix="bluesky-db"
+        )
+
+    @property
+    def db_path(self) -> str:
+        return self._db.db_path
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args)
+        )
+
+    async def save_posts(self, posts: List[Post]) -> dict[str, int]:
+        return await self._run(self._db.save_posts, posts)
+
+    async def get_posts_by_date_range(
+        self,
+        start_date: dt.datetime,
+        end_date: dt.datetime,
+        author_substr: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Post]:
+        return await self._run(
+            self._db.get_posts_by_date_range,
+            start_date,
+            end_date,
+            author_substr,
+            limit,
+        )
+
+    async def get_existing_uris(self, uris: List[str]) -> set[str]:
+        return await self._run(self._db.get_existing_uris, uris)
+
+    async def close(self) -> None:
+        """Wait for in-flight calls, then close every pooled connection."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._executor.shutdown)
+        self._db.close()
+
+    async def __aenter__(self) -> "AsyncDatabaseManager":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
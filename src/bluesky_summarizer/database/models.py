@@ -25,12 +25,8 @@ class Post(BaseModel):
     reply_count: int = Field(default=0, ge=0, description="Number of replies")
     indexed_at: datetime = Field(..., description="When the post was indexed")
 
-    @field_validator("created_at", "indexed_at", mode="before")
-    @classmethod
-    def parse_datetime(cls, v):
-        if isinstance(v, str):
-            return datetime.fromisoformat(v.replace("Z", "+00:00"))
-        return v
+    # Timestamp strings (including a trailing "Z") are parsed natively by
+    # pydantic-core, so construction stays entirely in the compiled validator.
 
 
 class Summary(BaseModel):
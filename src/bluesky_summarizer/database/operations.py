@@ -7,417 +7,801 @@ from __future__ import annotations
 
 import os
 import sqlite3
+import threading
+import time
+import warnings
+import zlib
 import datetime as dt
-from typing import Any, List, Optional
+import json
+import logging
+from contextlib import contextmanager, suppress
+from typing import Any, Callable, Iterator, List, Optional
 
 from .models import Post, Summary
 
+logger = logging.getLogger(__name__)
+
 
 def adapt_date_iso(val: Any) -> Any:  # date -> ISO
     return val.isoformat()
 
 
-def adapt_datetime_iso(val: Any) -> Any:  # datetime -> naive ISO
-    return val.replace(tzinfo=None).isoformat()
-
-
 def adapt_datetime_epoch(val: Any) -> int:  # datetime -> epoch int
     return int(val.timestamp())
 
 
 sqlite3.register_adapter(dt.date, adapt_date_iso)
-sqlite3.register_adapter(dt.datetime, adapt_datetime_iso)
+# Datetimes are stored as epoch seconds (INTEGER columns)
 sqlite3.register_adapter(dt.datetime, adapt_datetime_epoch)
 
+# No converters are registered: connections do not set detect_types, and
+# rows are turned back into models by _row_to_post / _row_to_summary.
+
+
+def text_hash(text: str) -> int:
+    """Cheap fingerprint stored in ``posts.text_hash`` to bucket equal texts.
+
+    Collisions are expected and harmless: duplicate queries always confirm
+    candidates by comparing the full text.
+    """
+    return zlib.crc32(text.encode("utf-8"))
+
+
+# indexed_at is stamped by SQLite rather than bound, saving a datetime
+# adaptation and a bind per row. It is written explicitly instead of relying on
+# the column default: databases upgraded from schema v1 keep the old
+# CURRENT_TIMESTAMP (text) default.
+_UPSERT_POST_SQL = """
+    INSERT INTO posts
+    (uri, cid, author_handle, author_did, text, text_hash, created_at,
+     like_count, repost_count, reply_count, indexed_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CAST(strftime('%s', 'now') AS INTEGER))
+    ON CONFLICT(uri) DO UPDATE SET
+        cid=excluded.cid,
+        author_handle=excluded.author_handle,
+        author_did=excluded.author_did,
+        text=excluded.text,
+        text_hash=excluded.text_hash,
+        like_count=excluded.like_count,
+        repost_count=excluded.repost_count,
+        reply_count=excluded.reply_count,
+        indexed_at=CAST(strftime('%s', 'now') AS INTEGER)
+"""
+
+# Statement texts are module constants so every call passes identical SQL and
+# hits the connection's compiled-statement cache.
+_POST_COLUMNS = """
+    id, uri, cid, author_handle, author_did, text, created_at,
+    like_count, repost_count, reply_count, indexed_at
+"""
+
+_SUMMARY_COLUMNS = (
+    "id, start_date, end_date, post_count, summary_text, model_used, created_at"
+)
+
+_INSERT_SUMMARY_SQL = """
+    INSERT INTO summaries
+    (start_date, end_date, post_count, summary_text, model_used, created_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_LATEST_SUMMARY_SQL = f"""
+    SELECT {_SUMMARY_COLUMNS}
+    FROM summaries
+    ORDER BY created_at DESC
+    LIMIT 1
+"""
+
+_FRESH_SUMMARY_BY_RANGE_SQL = f"""
+    SELECT {_SUMMARY_COLUMNS}
+    FROM summaries AS s
+    WHERE start_date = ? AND end_date = ? AND model_used = ?
+      AND NOT EXISTS (
+          SELECT 1 FROM posts
+          WHERE created_at BETWEEN s.start_date AND s.end_date
+            AND indexed_at > s.created_at
+      )
+    ORDER BY created_at DESC
+    LIMIT 1
+"""
+
+# Groups of identical post texts. Only rows whose text_hash bucket holds more
+# than one post (read off idx_posts_text_hash) are grouped by full text. Rows
+# written without a hash, and any rows sharing their text, are always checked.
+_DUPLICATE_TEXT_GROUPS_SQL = """
+    SELECT text, COUNT(*) AS cnt
+    FROM posts
+    WHERE text_hash IN (
+        SELECT text_hash FROM posts GROUP BY text_hash HAVING COUNT(*) > 1
+    )
+       OR text IN (SELECT text FROM posts WHERE text_hash IS NULL)
+    GROUP BY text
+    HAVING cnt > 1
+"""
 
-def convert_date(val: Any) -> dt.date:
-    return dt.date.fromisoformat(val.decode())
+_SUMMARIES_IN_RANGE_SQL = f"""
+    SELECT {_SUMMARY_COLUMNS}
+    FROM summaries
+    WHERE start_date >= ? AND end_date <= ?
+    ORDER BY created_at DESC
+"""
+
+
+_UPSERT_METADATA_SQL = (
+    "INSERT INTO metadata (key, value) VALUES (?, ?) "
+    "ON CONFLICT(key) DO UPDATE SET value=excluded.value"
+)
 
+# One statement per get_top_posts ordering, built once at import
+_TOP_POSTS_SQL = {
+    order_by: f"""
+    SELECT {_POST_COLUMNS}
+    FROM posts
+    WHERE created_at BETWEEN ? AND ?
+    ORDER BY {metric} DESC, created_at DESC
+    LIMIT ?
+"""
+    for order_by, metric in {
+        "like_count": "like_count",
+        "repost_count": "repost_count",
+        "reply_count": "reply_count",
+        "total_engagement": "like_count + repost_count + reply_count",
+    }.items()
+}
+
+# The URIs are bound as one JSON array, so any batch size uses the same
+# statement without hitting SQLITE_MAX_VARIABLE_NUMBER. CROSS JOIN keeps
+# json_each as the outer loop, probing the UNIQUE uri index once per URI.
+_SELECT_EXISTING_URIS_SQL = """
+    SELECT p.uri FROM json_each(?) AS j CROSS JOIN posts AS p ON p.uri = j.value
+"""
 
-def convert_datetime(val: Any) -> dt.datetime:
-    return dt.datetime.fromisoformat(val.decode())
+# Bumped with every schema change; mirrored in PRAGMA user_version
+_SCHEMA_VERSION = 4
 
+# New post rows after which planner statistics are refreshed
+_ANALYZE_THRESHOLD = 5000
 
-def convert_timestamp(val: Any) -> dt.datetime:
-    return dt.datetime.fromtimestamp(int(val))
+# Rows deleted per transaction when pruning, bounding how long the write
+# lock is held and how large each WAL commit grows
+_PRUNE_CHUNK_SIZE = 10000
 
+_PRUNE_CHUNK_SQL = """
+    DELETE FROM posts WHERE id IN (
+        SELECT id FROM posts WHERE created_at < ? ORDER BY created_at LIMIT ?
+    )
+"""
 
-sqlite3.register_converter("date", convert_date)
-sqlite3.register_converter("datetime", convert_datetime)
-sqlite3.register_converter("timestamp", convert_timestamp)
+# Count queries are answered from memory within the same window of this many
+# seconds unless this manager writes posts in between
+_COUNT_CACHE_TTL = 5
 
 
 class DatabaseManager:
     """SQLite database manager for posts & summaries."""
 
-    def __init__(self, db_path: str) -> None:
+    def __init__(
+        self,
+        db_path: str,
+        cache_size_kib: int = 65536,
+        mmap_size: int = 268435456,
+    ) -> None:
         self.db_path = db_path
+        # Per-connection page cache and memory-mapped I/O limits (bytes)
+        self.cache_size_kib = cache_size_kib
+        self.mmap_size = mmap_size
+        # One long-lived connection per thread (the streaming worker and the
+        # CLI thread share a manager); all are tracked so close() can reach them.
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._rows_since_analyze = 0
+        self._count_cache: dict[tuple, int] = {}
+        self._count_cache_bucket = -1
         self._ensure_dir()
         self._init_schema()
 
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self) -> None:
+        """Close every connection opened by this manager.
+
+        The manager stays usable; the next operation reconnects.
+        """
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            # Cheap: only re-analyzes tables whose contents changed materially
+            with suppress(sqlite3.Error):
+                conn.execute("PRAGMA optimize")
+            conn.close()
+        self._local = threading.local()
+
     # Internal helpers --------------------------------------------------
+    def _cached_count(self, key: tuple, compute: Callable[[], int]) -> int:
+        bucket = int(time.monotonic()) // _COUNT_CACHE_TTL
+        if bucket != self._count_cache_bucket:
+            self._count_cache = {}
+            self._count_cache_bucket = bucket
+        cache = self._count_cache
+        if key not in cache:
+            cache[key] = compute()
+        return cache[key]
+
+    def _invalidate_counts(self) -> None:
+        self._count_cache = {}
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Cursor]:
+        """Run a block of writes as one transaction (and one WAL commit).
+
+        Connections autocommit each statement, so multi-statement writers
+        group their work here; BEGIN IMMEDIATE takes the write lock up front.
+        """
+        cur = self._conn.cursor()
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            yield cur
+        except BaseException:
+            cur.execute("ROLLBACK")
+            raise
+        cur.execute("COMMIT")
+
     def _ensure_dir(self) -> None:
         d = os.path.dirname(self.db_path)
         if d and not os.path.exists(d):
             os.makedirs(d)
 
     def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        # check_same_thread=False only so close() may run on another thread;
+        # each connection is otherwise used by the thread that opened it.
+        conn = sqlite3.connect(
+            self.db_path, timeout=30, isolation_level=None, check_same_thread=False
+        )
         cur = conn.cursor()
         try:
             cur.execute("PRAGMA journal_mode=WAL;")
             cur.execute("PRAGMA synchronous=NORMAL;")
             cur.execute("PRAGMA foreign_keys=ON;")
             cur.execute("PRAGMA busy_timeout=5000;")
+            # A negative cache_size is in KiB rather than pages
+            cur.execute(f"PRAGMA cache_size=-{int(self.cache_size_kib)};")
+            cur.execute("PRAGMA temp_store=MEMORY;")
+            cur.execute(f"PRAGMA mmap_size={int(self.mmap_size)};")
         except sqlite3.Error:
             pass
         return conn
 
     def _init_schema(self) -> None:
-        with self._connect() as conn:
-            cur = conn.cursor()
-            # Metadata table for schema versioning
-            cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS metadata (
-                    key TEXT PRIMARY KEY,
-                    value TEXT NOT NULL
-                )
-                """
-            )
-            cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS posts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    uri TEXT UNIQUE NOT NULL,
-                    cid TEXT NOT NULL,
-                    author_handle TEXT NOT NULL,
-                    author_did TEXT NOT NULL,
-                    text TEXT NOT NULL,
-                    created_at TIMESTAMP NOT NULL,
-                    like_count INTEGER DEFAULT 0,
-                    repost_count INTEGER DEFAULT 0,
-                    reply_count INTEGER DEFAULT 0,
-                    indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-                """
+        cur = self._conn.cursor()
+        # user_version is stored in the file header, so once a database is set
+        # up later managers (in any process) skip the DDL with one cheap read
+        cur.execute("PRAGMA user_version")
+        if cur.fetchone()[0] >= _SCHEMA_VERSION:
+            return
+        # DDL, migrations and the version bump commit together, so a failure
+        # leaves the previous schema intact
+        with self._transaction() as cur:
+            # Another process may have finished setup while we waited
+            cur.execute("PRAGMA user_version")
+            if cur.fetchone()[0] < _SCHEMA_VERSION:
+                self._create_schema(cur)
+
+    def _create_schema(self, cur: sqlite3.Cursor) -> None:
+        # Metadata table for schema versioning
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS metadata (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
             )
-            cur.execute(
-                """
-                CREATE TABLE IF NOT EXISTS summaries (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    start_date TIMESTAMP NOT NULL,
-                    end_date TIMESTAMP NOT NULL,
-                    post_count INTEGER NOT NULL,
-                    summary_text TEXT NOT NULL,
-                    model_used TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-                """
-            )
-            cur.execute(
-                "CREATE INDEX IF NOT EXISTS idx_posts_created_at ON posts(created_at)"
-            )
-            cur.execute(
-                "CREATE INDEX IF NOT EXISTS idx_posts_author_handle ON posts(author_handle)"
-            )
-            # Composite index for author + created_at (query optimization)
-            cur.execute(
-                "CREATE INDEX IF NOT EXISTS idx_posts_author_created ON posts(author_handle, created_at)"
-            )
-            cur.execute(
-                "CREATE INDEX IF NOT EXISTS idx_summaries_date_range ON summaries(start_date, end_date)"
-            )
-            # Record schema version if not present
-            cur.execute(
-                "INSERT OR IGNORE INTO metadata (key, value) VALUES ('schema_version', '1')"
-            )
-            # Track last seen cursor / timestamp for streaming continuity
-            cur.execute(
-                "INSERT OR IGNORE INTO metadata (key, value) VALUES ('last_stream_cursor', '')"
+            """
+        )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS posts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                uri TEXT UNIQUE NOT NULL,
+                cid TEXT NOT NULL,
+                author_handle TEXT NOT NULL,
+                author_did TEXT NOT NULL,
+                text TEXT NOT NULL,
+                text_hash INTEGER,
+                created_at INTEGER NOT NULL,
+                like_count INTEGER DEFAULT 0,
+                repost_count INTEGER DEFAULT 0,
+                reply_count INTEGER DEFAULT 0,
+                indexed_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
             )
-            cur.execute(
-                "INSERT OR IGNORE INTO metadata (key, value) VALUES ('last_stream_time', '')"
+            """
+        )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS summaries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                start_date INTEGER NOT NULL,
+                end_date INTEGER NOT NULL,
+                post_count INTEGER NOT NULL,
+                summary_text TEXT NOT NULL,
+                model_used TEXT NOT NULL,
+                created_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
             )
-            conn.commit()
+            """
+        )
+        # Covers the range COUNT (with or without the author filter) and the
+        # summary cache's freshness probe; supersedes the created_at-only index
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_posts_created_covering "
+            "ON posts(created_at, author_handle, indexed_at)"
+        )
+        cur.execute("DROP INDEX IF EXISTS idx_posts_created_at")
+        # A prefix of idx_posts_author_created; only cost upsert writes
+        cur.execute("DROP INDEX IF EXISTS idx_posts_author_handle")
+        # Composite index for author + created_at (query optimization)
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_posts_author_created ON posts(author_handle, created_at)"
+        )
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_summaries_date_range ON summaries(start_date, end_date)"
+        )
+        # Latest summary lookups read one entry from the end of this index
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_summaries_created_at ON summaries(created_at)"
+        )
+        # Record schema version if not present, and track last seen cursor /
+        # timestamp for streaming continuity
+        cur.executemany(
+            "INSERT OR IGNORE INTO metadata (key, value) VALUES (?, ?)",
+            [
+                ("schema_version", "1"),
+                ("last_stream_cursor", ""),
+                ("last_stream_time", ""),
+            ],
+        )
+        self._migrate_timestamps_to_epoch(cur)
+        self._add_text_hash(cur)
+        cur.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    @staticmethod
+    def _migrate_timestamps_to_epoch(cur: sqlite3.Cursor) -> None:
+        """Schema v2: rewrite ISO timestamp text as INTEGER epoch seconds.
+
+        Older databases stored some timestamps as ISO text, which compares
+        incorrectly against the epoch integers used for range queries.
+        """
+        cur.execute("SELECT value FROM metadata WHERE key = 'schema_version'")
+        if cur.fetchone()[0] != "1":
+            return
+        columns = {
+            "posts": ("created_at", "indexed_at"),
+            "summaries": ("start_date", "end_date", "created_at"),
+        }
+        for table, names in columns.items():
+            for name in names:
+                cur.execute(
+                    f"UPDATE {table} "
+                    f"SET {name} = CAST(strftime('%s', {name}) AS INTEGER) "
+                    f"WHERE typeof({name}) = 'text' "
+                    f"AND strftime('%s', {name}) IS NOT NULL"
+                )
+        cur.execute("UPDATE metadata SET value = '2' WHERE key = 'schema_version'")
+
+    @staticmethod
+    def _add_text_hash(cur: sqlite3.Cursor) -> None:
+        """Schema v4: add and backfill ``posts.text_hash`` and its index."""
+        cur.execute("PRAGMA table_info(posts)")
+        if "text_hash" not in {row[1] for row in cur.fetchall()}:
+            cur.execute("ALTER TABLE posts ADD COLUMN text_hash INTEGER")
+        cur.execute("SELECT id, text FROM posts WHERE text_hash IS NULL")
+        rows = [(text_hash(text), post_id) for post_id, text in cur.fetchall()]
+        cur.executemany("UPDATE posts SET text_hash = ? WHERE id = ?", rows)
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_posts_text_hash ON posts(text_hash)"
+        )
 
     # Post operations ---------------------------------------------------
     def save_post(self, post: Post) -> int:
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                """
-                INSERT OR REPLACE INTO posts
-                (uri, cid, author_handle, author_did, text, created_at,
-                 like_count, repost_count, reply_count, indexed_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    post.uri,
-                    post.cid,
-                    post.author_handle,
-                    post.author_did,
-                    post.text,
-                    post.created_at,
-                    post.like_count,
-                    post.repost_count,
-                    post.reply_count,
-                    post.indexed_at,
-                ),
-            )
-            return cur.lastrowid
+        """Insert or update one post and return its row id.
+
+        Uses the same in-place UPSERT as save_posts, so an existing post keeps
+        its id instead of being deleted and re-inserted.
+        """
+        cur = self._conn.cursor()
+        cur.execute(
+            _UPSERT_POST_SQL,
+            (
+                post.uri,
+                post.cid,
+                post.author_handle,
+                post.author_did,
+                post.text,
+                text_hash(post.text),
+                post.created_at,
+                post.like_count,
+                post.repost_count,
+                post.reply_count,
+            ),
+        )
+        self._invalidate_counts()
+        # lastrowid is only set when the UPSERT inserted a row
+        cur.execute("SELECT id FROM posts WHERE uri = ?", (post.uri,))
+        return cur.fetchone()[0]
 
     def post_exists(self, uri: str) -> bool:
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute("SELECT 1 FROM posts WHERE uri = ? LIMIT 1", (uri,))
-            return cur.fetchone() is not None
+        """Deprecated: use :meth:`get_existing_uris`, which checks a batch at once."""
+        warnings.warn(
+            "post_exists() is deprecated; use get_existing_uris()",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return uri in self.get_existing_uris([uri])
 
     def get_existing_uris(self, uris: List[str]) -> set[str]:
+        """Return the subset of ``uris`` already stored.
+
+        Pass every URI of interest in one call: any batch size runs at most a
+        single query, so looping over single URIs only adds round trips.
+        """
         if not uris:
             return set()
-        with self._connect() as conn:
-            cur = conn.cursor()
-            placeholders = ",".join("?" * len(uris))
-            cur.execute(f"SELECT uri FROM posts WHERE uri IN ({placeholders})", uris)
-            return {row[0] for row in cur.fetchall()}
+        return self._existing_uris(self._conn.cursor(), uris)
+
+    @staticmethod
+    def _existing_uris(cur: sqlite3.Cursor, uris: List[str]) -> set[str]:
+        cur.execute(_SELECT_EXISTING_URIS_SQL, (json.dumps(uris),))
+        return {row[0] for row in cur}
 
     def save_posts(self, posts: List[Post]) -> dict[str, int]:
         if not posts:
             return {"new": 0, "updated": 0, "total": 0}
-        existing = self.get_existing_uris([p.uri for p in posts])
-        new_count = 0
-        updated_count = 0
-        seen: set[str] = set()
-        with self._connect() as conn:
-            cur = conn.cursor()
-            for p in posts:
-                try:
-                    is_existing = p.uri in existing or p.uri in seen
-                    # UPSERT preserving immutable created_at while updating mutable fields
-                    cur.execute(
-                        """
-                        INSERT INTO posts
-                        (uri, cid, author_handle, author_did, text, created_at,
-                         like_count, repost_count, reply_count, indexed_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        ON CONFLICT(uri) DO UPDATE SET
-                            cid=excluded.cid,
-                            author_handle=excluded.author_handle,
-                            author_did=excluded.author_did,
-                            text=excluded.text,
-                            like_count=excluded.like_count,
-                            repost_count=excluded.repost_count,
-                            reply_count=excluded.reply_count,
-                            indexed_at=excluded.indexed_at
-                        """,
-                        (
-                            p.uri,
-                            p.cid,
-                            p.author_handle,
-                            p.author_did,
-                            p.text,
-                            p.created_at,
-                            p.like_count,
-                            p.repost_count,
-                            p.reply_count,
-                            p.indexed_at,
-                        ),
-                    )
-                    if is_existing:
-                        updated_count += 1
-                    else:
-                        new_count += 1
-                    seen.add(p.uri)
-                except sqlite3.Error as e:  # log & continue
-                    import logging
-
-                    logging.getLogger(__name__).error(
-                        "Error saving post %s: %s", p.uri, e
-                    )
-            conn.commit()
+        rows = [
+            (
+                p.uri,
+                p.cid,
+                p.author_handle,
+                p.author_did,
+                p.text,
+                text_hash(p.text),
+                p.created_at,
+                p.like_count,
+                p.repost_count,
+                p.reply_count,
+            )
+            for p in posts
+        ]
+        # One write transaction for the whole batch
+        with self._transaction() as cur:
+            # AUTOINCREMENT ids only grow and an UPSERT update keeps the row's
+            # id, so rows above the previous maximum are exactly the new ones
+            cur.execute("SELECT COALESCE(MAX(id), 0) FROM posts")
+            max_id = cur.fetchone()[0]
+            # UPSERT preserving immutable created_at while updating mutable fields
+            cur.execute("SAVEPOINT batch")
+            try:
+                cur.executemany(_UPSERT_POST_SQL, rows)
+                saved = len(rows)
+            except sqlite3.Error:
+                # Slow path only on failure: redo the batch row by row so one
+                # bad post does not discard the rest
+                cur.execute("ROLLBACK TO batch")
+                saved = self._upsert_rows_individually(cur, rows)
+            cur.execute("RELEASE batch")
+            cur.execute("SELECT COUNT(*) FROM posts WHERE id > ?", (max_id,))
+            new_count = cur.fetchone()[0]
+        self._invalidate_counts()
+        self._rows_since_analyze += new_count
+        if self._rows_since_analyze >= _ANALYZE_THRESHOLD:
+            # Keep range/GROUP BY plans in step with the table after bulk loads
+            cur.execute("ANALYZE posts")
+            self._rows_since_analyze = 0
+        # Repeats of a URI within the batch count as updates, as before
+        updated_count = saved - new_count
         return {
             "new": new_count,
             "updated": updated_count,
             "total": new_count + updated_count,
         }
 
-    def get_posts_by_date_range(
-        self, start_date: dt.datetime, end_date: dt.datetime
-    ) -> List[Post]:
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                """
-                SELECT id, uri, cid, author_handle, author_did, text, created_at,
-                       like_count, repost_count, reply_count, indexed_at
+    @staticmethod
+    def _upsert_rows_individually(cur: sqlite3.Cursor, rows: List[tuple]) -> int:
+        """Upsert rows one at a time, logging and skipping failures."""
+        saved = 0
+        for row in rows:
+            try:
+                cur.execute(_UPSERT_POST_SQL, row)
+                saved += 1
+            except sqlite3.Error as e:  # log & continue
+                logger.error("Error saving post %s: %s", row[0], e)
+        return saved
+
+    @staticmethod
+    def _date_range_filter(
+        start_date: dt.datetime,
+        end_date: dt.datetime,
+        author_substr: Optional[str] = None,
+    ) -> tuple[str, list[Any]]:
+        """Build the WHERE clause shared by the date range queries.
+
+        ``author_substr`` is matched case-insensitively anywhere in the handle.
+        """
+        where = "created_at BETWEEN ? AND ?"
+        params: list[Any] = [start_date, end_date]
+        if author_substr:
+            escaped = (
+                author_substr.replace("\\", "\\\\")
+                .replace("%", "\\%")
+                .replace("_", "\\_")
+            )
+            where += " AND author_handle LIKE ? ESCAPE '\\'"
+            params.append(f"%{escaped}%")
+        return where, params
+
+    @staticmethod
+    def _row_to_post(r: tuple) -> Post:
+        return Post(
+            id=r[0],
+            uri=r[1],
+            cid=r[2],
+            author_handle=r[3],
+            author_did=r[4],
+            text=r[5],
+            created_at=r[6],
+            like_count=r[7],
+            repost_count=r[8],
+            reply_count=r[9],
+            indexed_at=r[10],
+        )
+
+    def _date_range_query(
+        self,
+        start_date: dt.datetime,
+        end_date: dt.datetime,
+        author_substr: Optional[str],
+        limit: Optional[int],
+    ) -> tuple[str, list[Any]]:
+        where, params = self._date_range_filter(start_date, end_date, author_substr)
+        query = f"""
+                SELECT {_POST_COLUMNS}
                 FROM posts
-                WHERE created_at BETWEEN ? AND ?
+                WHERE {where}
                 ORDER BY created_at ASC
-                """,
-                (start_date, end_date),
-            )
-            rows = cur.fetchall()
-            return [
-                Post(
-                    id=r[0],
-                    uri=r[1],
-                    cid=r[2],
-                    author_handle=r[3],
-                    author_did=r[4],
-                    text=r[5],
-                    created_at=r[6],
-                    like_count=r[7],
-                    repost_count=r[8],
-                    reply_count=r[9],
-                    indexed_at=r[10],
-                )
-                for r in rows
-            ]
+                """
+        if limit is not None and limit > 0:
+            query += " LIMIT ?"
+            params.append(limit)
+        return query, params
+
+    def get_posts_by_date_range(
+        self,
+        start_date: dt.datetime,
+        end_date: dt.datetime,
+        author_substr: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Post]:
+        """Return posts in a date range, oldest first.
+
+        Filtering by author and limiting happen in SQL so only the rows that
+        will be used are materialized.
+        """
+        query, params = self._date_range_query(
+            start_date, end_date, author_substr, limit
+        )
+        cur = self._conn.cursor()
+        cur.execute(query, params)
+        # Rows are hydrated straight off the cursor, without an intermediate
+        # list of tuples
+        return [self._row_to_post(r) for r in cur]
+
+    def iter_posts_by_date_range(
+        self,
+        start_date: dt.datetime,
+        end_date: dt.datetime,
+        author_substr: Optional[str] = None,
+        limit: Optional[int] = None,
+        chunk_size: int = 64,
+    ) -> Iterator[Post]:
+        """Yield the posts get_posts_by_date_range would return, lazily.
+
+        Rows are read ``chunk_size`` at a time, so memory stays bounded and
+        the first posts are available before the whole result is read.
+        """
+        query, params = self._date_range_query(
+            start_date, end_date, author_substr, limit
+        )
+        cur = self._conn.cursor()
+        cur.execute(query, params)
+        try:
+            while rows := cur.fetchmany(chunk_size):
+                for r in rows:
+                    yield self._row_to_post(r)
+        finally:
+            # An abandoned iterator may be finalized after close()
+            with suppress(sqlite3.ProgrammingError):
+                cur.close()
+
+    def count_posts_by_date_range(
+        self,
+        start_date: dt.datetime,
+        end_date: dt.datetime,
+        author_substr: Optional[str] = None,
+    ) -> int:
+        """Count posts matching the same filters as get_posts_by_date_range."""
+        where, params = self._date_range_filter(start_date, end_date, author_substr)
+
+        def compute() -> int:
+            cur = self._conn.cursor()
+            cur.execute(f"SELECT COUNT(*) FROM posts WHERE {where}", params)
+            return int(cur.fetchone()[0])
+
+        return self._cached_count(("range", *params), compute)
 
     # Summary operations -------------------------------------------------
     def save_summary(self, summary: Summary) -> int:
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                """
-                INSERT INTO summaries
-                (start_date, end_date, post_count, summary_text, model_used, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    summary.start_date,
-                    summary.end_date,
-                    summary.post_count,
-                    summary.summary_text,
-                    summary.model_used,
-                    summary.created_at,
-                ),
-            )
-            return cur.lastrowid
+        cur = self._conn.cursor()
+        cur.execute(
+            _INSERT_SUMMARY_SQL,
+            (
+                summary.start_date,
+                summary.end_date,
+                summary.post_count,
+                summary.summary_text,
+                summary.model_used,
+                summary.created_at,
+            ),
+        )
+        return cur.lastrowid
+
+    @staticmethod
+    def _row_to_summary(r: tuple) -> Summary:
+        return Summary(
+            id=r[0],
+            start_date=r[1],
+            end_date=r[2],
+            post_count=r[3],
+            summary_text=r[4],
+            model_used=r[5],
+            created_at=r[6],
+        )
+
+    @classmethod
+    def _fetch_latest_summary(cls, cur: sqlite3.Cursor) -> Optional[Summary]:
+        cur.execute(_LATEST_SUMMARY_SQL)
+        row = cur.fetchone()
+        return cls._row_to_summary(row) if row else None
+
+    def get_summary_by_range(
+        self, start_date: dt.datetime, end_date: dt.datetime, model: str
+    ) -> Optional[Summary]:
+        """Return the newest summary for exactly this range and model.
+
+        Summaries are skipped once any post in their range has been saved
+        after them (``indexed_at`` is refreshed on every upsert), so a fetch
+        that adds or updates posts invalidates the cached result.
+        """
+        cur = self._conn.cursor()
+        cur.execute(_FRESH_SUMMARY_BY_RANGE_SQL, (start_date, end_date, model))
+        row = cur.fetchone()
+        return self._row_to_summary(row) if row else None
 
     def get_latest_summary(self) -> Optional[Summary]:
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                """
-                SELECT id, start_date, end_date, post_count, summary_text, model_used, created_at
-                FROM summaries
-                ORDER BY created_at DESC
-                LIMIT 1
-                """
-            )
-            row = cur.fetchone()
-            if not row:
-                return None
-            return Summary(
-                id=row[0],
-                start_date=row[1],
-                end_date=row[2],
-                post_count=row[3],
-                summary_text=row[4],
-                model_used=row[5],
-                created_at=row[6],
-            )
+        return self._fetch_latest_summary(self._conn.cursor())
 
     def get_summaries_by_date_range(
         self, start_date: dt.datetime, end_date: dt.datetime
     ) -> List[Summary]:
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                """
-                SELECT id, start_date, end_date, post_count, summary_text, model_used, created_at
-                FROM summaries
-                WHERE start_date >= ? AND end_date <= ?
-                ORDER BY created_at DESC
-                """,
-                (start_date, end_date),
-            )
-            rows = cur.fetchall()
-            return [
-                Summary(
-                    id=r[0],
-                    start_date=r[1],
-                    end_date=r[2],
-                    post_count=r[3],
-                    summary_text=r[4],
-                    model_used=r[5],
-                    created_at=r[6],
-                )
-                for r in rows
-            ]
+        cur = self._conn.cursor()
+        cur.execute(_SUMMARIES_IN_RANGE_SQL, (start_date, end_date))
+        return [self._row_to_summary(r) for r in cur]
 
     # Integrity helpers -------------------------------------------------
+    def _scalar(self, sql: str) -> int:
+        cur = self._conn.cursor()
+        cur.execute(sql)
+        return cur.fetchone()[0]
+
     def get_total_post_count(self) -> int:
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute("SELECT COUNT(*) FROM posts")
-            return cur.fetchone()[0]
+        return self._cached_count(
+            ("total",), lambda: self._scalar("SELECT COUNT(*) FROM posts")
+        )
 
     def get_unique_uri_count(self) -> int:
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute("SELECT COUNT(DISTINCT uri) FROM posts")
-            return cur.fetchone()[0]
+        return self._cached_count(
+            ("unique",), lambda: self._scalar("SELECT COUNT(DISTINCT uri) FROM posts")
+        )
 
     def get_duplicate_content_count(self) -> int:
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                """
-                SELECT COUNT(*) FROM (
-                    SELECT text, COUNT(*) as cnt
-                    FROM posts
-                    GROUP BY text
-                    HAVING cnt > 1
-                ) AS duplicates
-                """
-            )
-            return cur.fetchone()[0]
+        sql = f"SELECT COUNT(*) FROM ({_DUPLICATE_TEXT_GROUPS_SQL})"
+        return self._cached_count(("duplicate",), lambda: self._scalar(sql))
+
+    def get_verification_stats(self) -> dict[str, int]:
+        """Return the integrity counts used by ``verify`` in one query.
+
+        Keys: ``total_posts``, ``unique_uris`` and ``duplicate_content`` (the
+        number of distinct texts shared by more than one post).
+        """
+        cur = self._conn.cursor()
+        # Each count is its own scalar subquery: alongside COUNT(*) the
+        # DISTINCT needs a temp B-tree, alone it walks the sorted UNIQUE index
+        cur.execute(
+            f"""
+            SELECT (SELECT COUNT(*) FROM posts),
+                   (SELECT COUNT(DISTINCT uri) FROM posts),
+                   (SELECT COUNT(*) FROM ({_DUPLICATE_TEXT_GROUPS_SQL}))
+            """
+        )
+        total, unique, duplicate = cur.fetchone()
+        return {
+            "total_posts": total,
+            "unique_uris": unique,
+            "duplicate_content": duplicate,
+        }
+
+    def get_status_bundle(self) -> dict[str, Any]:
+        """Return ``total_posts`` and ``latest_summary`` over one connection."""
+        cur = self._conn.cursor()
+        cur.execute("SELECT COUNT(*) FROM posts")
+        total = cur.fetchone()[0]
+        return {
+            "total_posts": total,
+            "latest_summary": self._fetch_latest_summary(cur),
+        }
 
     def get_posts_with_duplicate_content(self) -> List[tuple[str, int]]:
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                """
-                SELECT text, COUNT(*) as cnt
-                FROM posts
-                GROUP BY text
-                HAVING cnt > 1
-                ORDER BY cnt DESC
-                """
-            )
-            return cur.fetchall()
+        cur = self._conn.cursor()
+        cur.execute(f"{_DUPLICATE_TEXT_GROUPS_SQL} ORDER BY cnt DESC")
+        return cur.fetchall()
 
     def find_duplicate_uris(self) -> List[str]:
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                """
-                SELECT uri, COUNT(*) as cnt
-                FROM posts
-                GROUP BY uri
-                HAVING cnt > 1
-                """
-            )
-            return [row[0] for row in cur.fetchall()]
+        cur = self._conn.cursor()
+        cur.execute(
+            """
+            SELECT uri, COUNT(*) as cnt
+            FROM posts
+            GROUP BY uri
+            HAVING cnt > 1
+            """
+        )
+        return [row[0] for row in cur]
 
     # Pruning / maintenance -------------------------------------------
     def prune_posts_older_than(self, before: dt.datetime) -> int:
         """Delete posts older than the given timestamp.
 
+        Rows are deleted in chunks, each its own transaction, so readers and
+        the streaming writer are not blocked for the whole prune. Fetch
+        coverage is trimmed to the cutoff, so a later fetch of the pruned
+        period goes back to the network.
+
         Returns number of rows deleted.
         """
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute("DELETE FROM posts WHERE created_at < ?", (before,))
-            deleted = cur.rowcount or 0
-            return deleted
+        cur = self._conn.cursor()
+        deleted = 0
+        while True:
+            cur.execute(_PRUNE_CHUNK_SQL, (before, _PRUNE_CHUNK_SIZE))
+            deleted += cur.rowcount
+            if cur.rowcount < _PRUNE_CHUNK_SIZE:
+                break
+            # Let the WAL be recycled between chunks instead of growing
+            cur.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        self._invalidate_counts()
+        coverage = self.get_fetch_coverage()
+        if coverage is not None and coverage[0] < before:
+            if coverage[1] <= before:
+                self.set_metadata_many({"fetched_from": "", "fetched_until": ""})
+            else:
+                self.set_fetch_coverage(before, coverage[1])
+        return deleted
 
     def vacuum(self) -> None:
-        with self._connect() as conn:
-            conn.execute("VACUUM")
+        self._conn.execute("VACUUM")
 
     def get_db_size_bytes(self) -> int:
         try:
@@ -427,19 +811,32 @@ class DatabaseManager:
 
     # Streaming state -------------------------------------------------
     def get_metadata(self, key: str) -> Optional[str]:
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute("SELECT value FROM metadata WHERE key = ?", (key,))
-            row = cur.fetchone()
-            return row[0] if row else None
+        cur = self._conn.cursor()
+        cur.execute("SELECT value FROM metadata WHERE key = ?", (key,))
+        row = cur.fetchone()
+        return row[0] if row else None
 
     def set_metadata(self, key: str, value: str) -> None:
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                "INSERT INTO metadata (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value=excluded.value",
-                (key, value),
-            )
+        cur = self._conn.cursor()
+        cur.execute(_UPSERT_METADATA_SQL, (key, value))
+
+    def set_metadata_many(self, items: dict[str, str]) -> None:
+        """Upsert several metadata keys in one transaction."""
+        with self._transaction() as cur:
+            cur.executemany(_UPSERT_METADATA_SQL, list(items.items()))
+
+    def get_fetch_coverage(self) -> Optional[tuple[dt.datetime, dt.datetime]]:
+        """Return the contiguous (start, end) window already fetched, if any."""
+        start = self.get_metadata("fetched_from")
+        end = self.get_metadata("fetched_until")
+        if not start or not end:
+            return None
+        return dt.datetime.fromisoformat(start), dt.datetime.fromisoformat(end)
+
+    def set_fetch_coverage(self, start: dt.datetime, end: dt.datetime) -> None:
+        self.set_metadata_many(
+            {"fetched_from": start.isoformat(), "fetched_until": end.isoformat()}
+        )
 
     # Analytics / engagement helpers ----------------------------------
     def get_top_posts(
@@ -453,46 +850,10 @@ class DatabaseManager:
 
         order_by can be one of like_count, repost_count, reply_count, total_engagement.
         """
-        valid = {"like_count", "repost_count", "reply_count", "total_engagement"}
-        if order_by not in valid:
-            raise ValueError(f"order_by must be one of {valid}")
-        metric_expr = (
-            "(like_count + repost_count + reply_count) AS total_engagement"
-            if order_by == "total_engagement"
-            else order_by
-        )
-        order_clause = (
-            "total_engagement DESC"
-            if order_by == "total_engagement"
-            else f"{order_by} DESC"
-        )
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                f"""
-                SELECT id, uri, cid, author_handle, author_did, text, created_at,
-                       like_count, repost_count, reply_count, indexed_at, {metric_expr}
-                FROM posts
-                WHERE created_at BETWEEN ? AND ?
-                ORDER BY {order_clause}, created_at DESC
-                LIMIT ?
-                """,
-                (start_date, end_date, limit),
-            )
-            rows = cur.fetchall()
-            return [
-                Post(
-                    id=r[0],
-                    uri=r[1],
-                    cid=r[2],
-                    author_handle=r[3],
-                    author_did=r[4],
-                    text=r[5],
-                    created_at=r[6],
-                    like_count=r[7],
-                    repost_count=r[8],
-                    reply_count=r[9],
-                    indexed_at=r[10],
-                )
-                for r in rows
-            ]
+        try:
+            sql = _TOP_POSTS_SQL[order_by]
+        except KeyError:
+            raise ValueError(f"order_by must be one of {set(_TOP_POSTS_SQL)}") from None
+        cur = self._conn.cursor()
+        cur.execute(sql, (start_date, end_date, limit))
+        return [self._row_to_post(r) for r in cur]
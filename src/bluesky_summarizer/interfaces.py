@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Protocol, List, Iterable
+from typing import Callable, Iterable, List, Optional, Protocol
 from datetime import datetime
 
 from .database.models import Post, Summary
@@ -11,7 +11,11 @@ from .database.models import Post, Summary
 class IPostRepository(Protocol):
     def save_posts(self, posts: List[Post]) -> dict[str, int]: ...  # noqa: D401
     def get_posts_by_date_range(
-        self, start_date: datetime, end_date: datetime
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        author_substr: Optional[str] = None,
+        limit: Optional[int] = None,
     ) -> List[Post]: ...  # noqa: D401,E501
     def get_top_posts(
         self,
@@ -30,7 +34,11 @@ class IPostSource(Protocol):
 
 class ISummarizer(Protocol):
     def summarize_posts(
-        self, posts: List[Post], start_date: datetime, end_date: datetime
+        self,
+        posts: List[Post],
+        start_date: datetime,
+        end_date: datetime,
+        on_token: Optional[Callable[[str], None]] = None,
     ) -> Summary: ...  # noqa: D401,E501
     def generate_custom_summary(
         self,
@@ -38,6 +46,7 @@ class ISummarizer(Protocol):
         custom_prompt: str,
         start_date: datetime,
         end_date: datetime,
+        on_token: Optional[Callable[[str], None]] = None,
     ) -> Summary: ...  # noqa: D401,E501
 
 
@@ -14,9 +14,11 @@ import time
 
 from atproto import Client
 
+from ..bluesky.client import create_http_request
 from ..database import DatabaseManager
 from ..database.models import Post
 from ..config import config
+from ..utils.dates import parse_atproto_timestamp
 
 
 logger = logging.getLogger(__name__)
@@ -48,7 +50,7 @@ class StreamingService:
         # Authentication
         self.bluesky_handle = bluesky_handle or config.bluesky.handle
         self.bluesky_password = bluesky_password or config.bluesky.password
-        self.client = Client()
+        self.client = Client(request=create_http_request())
         self._authenticated = False
 
         # State management
@@ -155,9 +157,7 @@ class StreamingService:
                 post = feed_item.post
 
                 # Parse the post creation date
-                created_at = datetime.fromisoformat(
-                    post.record.created_at.replace("Z", "+00:00")
-                )
+                created_at = parse_atproto_timestamp(post.record.created_at)
 
                 # Only process posts within our time window
                 if created_at < start_time:
@@ -301,8 +301,14 @@ class StreamingService:
                 "last_cursor": self._last_cursor,
             }
 
-    def start(self):
-        """Start the streaming service."""
+    def start(self, block: bool = True):
+        """Start the streaming service.
+
+        Args:
+            block: Wait until the service is stopped. With ``False`` this
+                returns as soon as the polling worker thread is running; use
+                ``wait()`` and ``stop()`` to manage it.
+        """
         if self.is_running:
             logger.warning("Streaming service is already running")
             return
@@ -338,6 +344,7 @@ class StreamingService:
             time.sleep(wait_for)
         if not self._authenticated:
             self.is_running = False
+            self._stop_event.set()
             raise RuntimeError("Failed to authenticate with Bluesky after retries")
 
         # Load previous stream time if exists
@@ -357,11 +364,12 @@ class StreamingService:
                 target=self._worker_loop, daemon=True
             )
             self._worker_thread.start()
+            if not block:
+                return
 
-            # Wait for stop signal
+            # Block until the worker exits (it does so once stop() is called)
             try:
-                while self.is_running and self._worker_thread.is_alive():
-                    time.sleep(1)
+                self._worker_thread.join()
             except KeyboardInterrupt:
                 logger.info("Received keyboard interrupt, stopping...")
                 self.stop()
@@ -371,6 +379,14 @@ class StreamingService:
             self.stop()
             raise
 
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the service stops or ``timeout`` elapses.
+
+        Returns:
+            True if the service has stopped, False on timeout
+        """
+        return self._stop_event.wait(timeout)
+
     def stop(self):
         """Stop the streaming service."""
         if not self.is_running:
@@ -1,6 +1,7 @@
 """Utility helpers for date range normalization and validation."""
 
 from __future__ import annotations
+import sys
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Tuple
 
@@ -40,3 +41,20 @@ def _ensure_utc(dt: datetime) -> datetime:
     if dt.tzinfo is None:
         return dt.replace(tzinfo=timezone.utc)
     return dt.astimezone(timezone.utc)
+
+
+if sys.version_info >= (3, 11):
+
+    def parse_atproto_timestamp(value: str) -> datetime:
+        """Parse an AT Protocol ``createdAt`` timestamp into a datetime.
+
+        Python 3.11+ ``fromisoformat`` accepts the trailing ``Z`` natively, so
+        the temporary string from ``replace("Z", "+00:00")`` is skipped.
+        """
+        return datetime.fromisoformat(value)
+
+else:
+
+    def parse_atproto_timestamp(value: str) -> datetime:
+        """Parse an AT Protocol ``createdAt`` timestamp into a datetime."""
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
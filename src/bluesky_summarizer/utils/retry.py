@@ -4,11 +4,29 @@ from __future__ import annotations
 import time
 import logging
 from functools import wraps
-from typing import Callable, Type, Tuple
+from typing import Any, Callable, Optional, Type, Tuple
 
 logger = logging.getLogger(__name__)
 
 
+def rate_limit_delay(exc: BaseException) -> Optional[float]:
+    """Seconds until the rate-limit window resets, if ``exc`` carries one.
+
+    Reads the ``RateLimit-Reset`` (epoch seconds) header from ``exc.response``
+    as attached by atproto's ``RequestErrorBase`` on HTTP 429 responses.
+    """
+    headers: Any = getattr(getattr(exc, "response", None), "headers", None)
+    if not isinstance(headers, dict):
+        return None
+    reset = headers.get("ratelimit-reset", headers.get("RateLimit-Reset"))
+    if reset is None:
+        return None
+    try:
+        return max(0.0, float(reset) - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
 def retry(
     *,
     exceptions: Tuple[Type[BaseException], ...] = (Exception,),
@@ -16,15 +34,25 @@ def retry(
     base_delay: float = 0.5,
     factor: float = 2.0,
     jitter: float = 0.1,
+    max_delay: float = 60.0,
+    max_reset_delay: float = 3600.0,
 ) -> Callable:
     """Retry decorator with exponential backoff and jitter.
 
+    When a failure carries a rate-limit reset time (see ``rate_limit_delay``)
+    the decorator sleeps until that reset instead of the backoff delay. That
+    wait is bounded by ``max_reset_delay`` rather than ``max_delay``: waking
+    before the window resets only earns another 429. A reset further away
+    than ``max_reset_delay`` is not waited for; the error is raised at once.
+
     Args:
         exceptions: Exception types to catch.
         attempts: Total attempts (initial + retries).
         base_delay: Initial sleep seconds.
         factor: Exponential multiplier.
         jitter: Added random jitter up to this value.
+        max_delay: Upper bound for any single backoff sleep.
+        max_reset_delay: Upper bound for sleeping until a rate-limit reset.
     """
     import random
 
@@ -38,15 +66,21 @@ def retry(
                     return fn(*args, **kwargs)
                 except exceptions as exc:  # noqa: PERF203 acceptable here
                     last_exc = exc
-                    if attempt == attempts:
+                    reset_in = rate_limit_delay(exc)
+                    if attempt == attempts or (
+                        reset_in is not None and reset_in > max_reset_delay
+                    ):
                         logger.error(
                             "Retry failed after %s attempts for %s: %s",
-                            attempts,
+                            attempt,
                             fn.__name__,
                             exc,
                         )
                         raise
-                    sleep_for = delay + random.uniform(0, jitter)
+                    if reset_in is not None:
+                        sleep_for = reset_in + random.uniform(0, jitter)
+                    else:
+                        sleep_for = min(max_delay, delay + random.uniform(0, jitter))
                     logger.warning(
                         "Attempt %s/%s failed for %s (%s). Retrying in %.2fs",
                         attempt,
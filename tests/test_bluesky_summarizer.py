@@ -5,13 +5,25 @@ Tests for the Bluesky Feed Summarizer application.
 import pytest
 from datetime import datetime, timezone, timedelta
 import os
+import time
 from typing import List
-from unittest.mock import Mock
+from unittest.mock import MagicMock, Mock, patch
 
-from bluesky_summarizer.bluesky.client import BlueSkyClient
+from atproto import SessionEvent
+
+from bluesky_summarizer.config import Config
+from bluesky_summarizer.bluesky.client import BlueSkyClient, RateLimitExceededError
 from bluesky_summarizer.database.models import Post, Summary
-from bluesky_summarizer.database.operations import DatabaseManager
+from bluesky_summarizer.database.operations import _SCHEMA_VERSION, DatabaseManager
 from bluesky_summarizer.ai.summarizer import ClaudeSummarizer
+from bluesky_summarizer.ai.stats import (
+    engagement_percentiles,
+    format_stats_block,
+    hour_histogram,
+    top_k_by_likes,
+)
+from bluesky_summarizer.utils.dates import parse_atproto_timestamp
+from bluesky_summarizer.cli import _plan_fetch_window
 
 # Global test database path
 TEST_DB_PATH = "test_database.db"
@@ -26,9 +38,10 @@ def setup_module() -> None:
 
 def teardown_module() -> None:
     """Clean up module-level fixtures."""
-    # Remove test database after all tests
-    if os.path.exists(TEST_DB_PATH):
-        os.unlink(TEST_DB_PATH)
+    # Remove test database (and any WAL side files) after all tests
+    for path in (TEST_DB_PATH, TEST_DB_PATH + "-wal", TEST_DB_PATH + "-shm"):
+        if os.path.exists(path):
+            os.unlink(path)
 
 
 class TestDatetimeComparison:
@@ -59,6 +72,12 @@ class TestDatetimeComparison:
         assert aware_dt.tzinfo is not None
         assert aware_dt.tzinfo == timezone.utc
 
+    def test_parse_atproto_timestamp(self) -> None:
+        """Test AT Protocol timestamps parse to UTC-aware datetimes."""
+        parsed: datetime = parse_atproto_timestamp("2024-01-01T12:00:00.123Z")
+        assert parsed == datetime(2024, 1, 1, 12, 0, 0, 123000, tzinfo=timezone.utc)
+        assert parse_atproto_timestamp("2024-01-01T12:00:00+00:00").tzinfo is not None
+
     def test_mixed_datetime_comparison_fails(self) -> None:
         """Test that comparing naive and aware datetimes raises TypeError."""
         naive_dt: datetime = datetime(2024, 1, 1, 12, 0, 0)
@@ -114,6 +133,90 @@ class TestBlueSkyClient:
         assert result is False
         assert self.client._authenticated is False
 
+    def test_authentication_reuses_cached_session(self, tmp_path) -> None:
+        """Test a cached session is resumed instead of creating a new one."""
+        session_file = tmp_path / "session.json"
+        client = BlueSkyClient(
+            "test.bsky.social", "test_password", session_path=str(session_file)
+        )
+
+        session = Mock()
+        session.encode.return_value = "cached-session"
+        client._on_session_change(SessionEvent.CREATE, session)
+        assert session_file.stat().st_mode & 0o777 == 0o600
+
+        mock_client = Mock()
+        client.client = mock_client
+        assert client.authenticate() is True
+        mock_client.login.assert_called_once_with(session_string="cached-session")
+
+        # A session cached for another account is ignored
+        other = BlueSkyClient("other.bsky.social", "pw", session_path=str(session_file))
+        other.client = Mock()
+        assert other.authenticate() is True
+        other.client.login.assert_called_once_with("other.bsky.social", "pw")
+
+    def test_authentication_falls_back_when_cached_session_rejected(
+        self, tmp_path
+    ) -> None:
+        """Test an expired cached session falls back to a password login."""
+        session_file = tmp_path / "session.json"
+        session_file.write_text(
+            '{"handle": "test.bsky.social", "session": "expired"}', encoding="utf-8"
+        )
+        client = BlueSkyClient(
+            "test.bsky.social", "test_password", session_path=str(session_file)
+        )
+        mock_client = Mock()
+        mock_client.login.side_effect = [Exception("ExpiredToken"), True]
+        client.client = mock_client
+
+        assert client.authenticate() is True
+        mock_client.login.assert_called_with("test.bsky.social", "test_password")
+
+    def test_authentication_waits_out_rate_limit(self) -> None:
+        """Test login sleeps until RateLimit-Reset and then retries."""
+        response = Mock()
+        response.status_code = 429
+        response.content = None
+        response.headers = {"ratelimit-reset": str(time.time() + 5)}
+
+        mock_client = Mock()
+        mock_client.login.side_effect = [RateLimitExceededError(response), True]
+        self.client.client = mock_client
+
+        with patch("bluesky_summarizer.utils.retry.time.sleep") as mock_sleep:
+            result: bool = self.client.authenticate()
+
+        assert result is True
+        assert mock_client.login.call_count == 2
+        slept: float = mock_sleep.call_args[0][0]
+        assert 3 < slept <= 6
+
+    def test_rate_limit_wait_not_capped_by_backoff_limit(self) -> None:
+        """Test a reset minutes away is waited out in full, not capped at 60s."""
+        response = Mock()
+        response.status_code = 429
+        response.content = None
+        response.headers = {"ratelimit-reset": str(time.time() + 300)}
+
+        mock_client = Mock()
+        mock_client.login.side_effect = [RateLimitExceededError(response), True]
+        self.client.client = mock_client
+
+        with patch("bluesky_summarizer.utils.retry.time.sleep") as mock_sleep:
+            assert self.client.authenticate() is True
+
+        slept: float = mock_sleep.call_args[0][0]
+        assert 298 < slept <= 301
+
+        # A reset beyond max_reset_delay is not waited for
+        response.headers = {"ratelimit-reset": str(time.time() + 86400)}
+        mock_client.login.side_effect = [RateLimitExceededError(response), True]
+        with patch("bluesky_summarizer.utils.retry.time.sleep") as mock_sleep:
+            assert self.client.authenticate() is False
+        mock_sleep.assert_not_called()
+
     def test_timezone_normalization_in_fetch(self) -> None:
         """Test that fetch_timeline_posts normalizes timezone-naive datetimes."""
         # Create timezone-naive datetimes
@@ -144,6 +247,125 @@ class TestBlueSkyClient:
         assert isinstance(result, list)
         assert len(result) == 0
 
+    def test_fetch_follows_cursor_across_pages(self) -> None:
+        """Test that pagination follows cursors and stops at the start date."""
+        now: datetime = datetime.now(timezone.utc)
+
+        def make_item(uri: str, created_at: datetime) -> Mock:
+            item = Mock()
+            item.post.uri = uri
+            item.post.cid = f"cid-{uri}"
+            item.post.author.handle = "test.bsky.social"
+            item.post.author.did = "did:plc:test123"
+            item.post.record.text = f"text {uri}"
+            item.post.record.created_at = created_at.isoformat()
+            item.post.like_count = 0
+            item.post.repost_count = 0
+            item.post.reply_count = 0
+            return item
+
+        page1 = Mock()
+        page1.feed = [
+            make_item("at://1", now - timedelta(hours=1)),
+            make_item("at://2", now - timedelta(hours=2)),
+        ]
+        page1.cursor = "cursor-2"
+        page2 = Mock()
+        page2.feed = [
+            make_item("at://3", now - timedelta(hours=3)),
+            make_item("at://4", now - timedelta(days=3)),
+        ]
+        page2.cursor = "cursor-3"
+
+        self.client._authenticated = True
+        self.client.client = Mock()
+        self.client.client.get_timeline.side_effect = [page1, page2]
+
+        result: List[Post] = self.client.fetch_timeline_posts(
+            now - timedelta(days=1), now
+        )
+
+        assert [p.uri for p in result] == ["at://3", "at://2", "at://1"]
+        assert self.client.client.get_timeline.call_count == 2
+        second_call = self.client.client.get_timeline.call_args_list[1]
+        assert second_call[1]["cursor"] == "cursor-2"
+
+    def test_fetch_many_backfills_each_author(self) -> None:
+        """Test per-author backfills run through each author's feed."""
+        now: datetime = datetime.now(timezone.utc)
+
+        def mock_get_author_feed(actor: str, limit: int, cursor=None) -> Mock:
+            item = Mock()
+            item.post.uri = f"at://{actor}/post/1"
+            item.post.cid = "cid"
+            item.post.author.handle = actor
+            item.post.author.did = f"did:plc:{actor}"
+            item.post.record.text = f"Post by {actor}"
+            item.post.record.created_at = (now - timedelta(hours=1)).isoformat()
+            item.post.like_count = 0
+            item.post.repost_count = 0
+            item.post.reply_count = 0
+            response = Mock()
+            response.feed = [item]
+            response.cursor = None
+            return response
+
+        self.client._authenticated = True
+        self.client.client = Mock()
+        self.client.client.get_author_feed.side_effect = mock_get_author_feed
+
+        result = self.client.fetch_many(
+            ["alice.bsky.social", "bob.bsky.social"], now - timedelta(days=1), now
+        )
+
+        assert set(result) == {"alice.bsky.social", "bob.bsky.social"}
+        assert result["bob.bsky.social"][0].author_handle == "bob.bsky.social"
+        assert self.client.client.get_author_feed.call_count == 2
+
+    def test_fetch_many_refreshes_session_once(self) -> None:
+        """Test concurrent workers hitting an expiring session refresh it once."""
+        import threading
+
+        from atproto import Client
+
+        from bluesky_summarizer.bluesky.client import _SessionLockedClient
+
+        now: datetime = datetime.now(timezone.utc)
+        handles: List[str] = [f"user{i}.bsky.social" for i in range(8)]
+        session: Mock = Mock(access_jwt="expiring")
+        all_checked = threading.Barrier(len(handles))
+        refreshes: List[str] = []
+
+        def mock_refresh() -> None:
+            refreshes.append(session.access_jwt)
+            time.sleep(0.05)
+            session.access_jwt = "refreshed"  # atproto updates it in place
+
+        def mock_get_author_feed(actor: str, limit: int, cursor=None) -> Mock:
+            # Mirror atproto's check-then-refresh before each request
+            should_refresh = session.access_jwt == "expiring"
+            all_checked.wait()
+            if should_refresh:
+                self.client.client._refresh_and_set_session()
+            return Mock(feed=[], cursor=None)
+
+        self.client._authenticated = True
+        with patch.object(_SessionLockedClient, "_session", session):
+            with patch.object(
+                Client, "_refresh_and_set_session", side_effect=mock_refresh
+            ):
+                with patch.object(
+                    self.client.client,
+                    "get_author_feed",
+                    side_effect=mock_get_author_feed,
+                ):
+                    result = self.client.fetch_many(
+                        handles, now - timedelta(days=1), now, max_workers=8
+                    )
+
+        assert set(result) == set(handles)
+        assert refreshes == ["expiring"]
+
     def test_post_conversion(self) -> None:
         """Test conversion of AT Protocol post to our Post model."""
         # Create mock AT Protocol post
@@ -276,6 +498,10 @@ class TestDatabaseOperations:
         # Clean database before each test
         self._clean_database()
 
+    def teardown_method(self) -> None:
+        """Close the test database connections."""
+        self.db_manager.close()
+
     def _clean_database(self) -> None:
         """Clean all data from the test database."""
         import sqlite3
@@ -292,6 +518,224 @@ class TestDatabaseOperations:
         # This test passes if no exceptions are raised
         assert self.db_manager.db_path == TEST_DB_PATH
 
+    def test_connection_reused_until_closed(self) -> None:
+        """Test operations share one connection per thread until close()."""
+        import sqlite3
+        import threading
+
+        conn = self.db_manager._conn
+        self.db_manager.get_total_post_count()
+        assert self.db_manager._conn is conn
+
+        other: List[sqlite3.Connection] = []
+        thread = threading.Thread(target=lambda: other.append(self.db_manager._conn))
+        thread.start()
+        thread.join()
+        assert other[0] is not conn
+
+        self.db_manager.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+        # The manager reconnects on next use
+        assert self.db_manager.get_total_post_count() == 0
+
+    def test_counts_cached_until_write(self) -> None:
+        """Test count queries are served from memory until posts are saved."""
+        import sqlite3
+
+        now: datetime = datetime.now(timezone.utc)
+        with patch("bluesky_summarizer.database.operations.time.monotonic") as clock:
+            clock.return_value = 0
+            assert self.db_manager.get_total_post_count() == 0
+
+            # A write from another connection is not seen within the TTL window
+            conn = sqlite3.connect(TEST_DB_PATH)
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT INTO posts (uri, cid, author_handle, author_did, "
+                        "text, created_at) "
+                        "VALUES ('at://test/post/raw', 'c', 'h', 'd', 't', 0)"
+                    )
+            finally:
+                conn.close()
+            assert self.db_manager.get_total_post_count() == 0
+            # ...but this manager's own writes invalidate the cache
+            self.db_manager.save_posts(
+                [
+                    Post(
+                        uri="at://test/post/cached",
+                        cid="cid",
+                        author_handle="test.bsky.social",
+                        author_did="did:plc:test",
+                        text="Post",
+                        created_at=now,
+                        indexed_at=now,
+                    )
+                ]
+            )
+            assert self.db_manager.get_total_post_count() == 2
+
+    def test_memory_pragmas_configurable(self, tmp_path) -> None:
+        """Test cache and mmap sizes are applied to each connection."""
+        db = DatabaseManager(
+            str(tmp_path / "tuned.db"), cache_size_kib=1024, mmap_size=0
+        )
+        conn = db._conn
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -1024
+        assert conn.execute("PRAGMA mmap_size").fetchone()[0] == 0
+        db.close()
+
+    def test_bulk_save_refreshes_planner_stats(self, monkeypatch) -> None:
+        """Test save_posts runs ANALYZE once enough new rows accumulate."""
+        from bluesky_summarizer.database import operations
+
+        monkeypatch.setattr(operations, "_ANALYZE_THRESHOLD", 2)
+        now: datetime = datetime.now(timezone.utc)
+        posts: List[Post] = [
+            Post(
+                uri=f"at://test/post/stats{i}",
+                cid=f"cid{i}",
+                author_handle="test.bsky.social",
+                author_did="did:plc:test123",
+                text=f"Post {i}",
+                created_at=now,
+                indexed_at=now,
+            )
+            for i in range(2)
+        ]
+        self.db_manager._conn.execute("DROP TABLE IF EXISTS sqlite_stat1")
+
+        self.db_manager.save_posts(posts[:1])
+        assert self.db_manager._rows_since_analyze == 1
+        self.db_manager.save_posts(posts[1:])
+        assert self.db_manager._rows_since_analyze == 0
+        stats = self.db_manager._conn.execute(
+            "SELECT COUNT(*) FROM sqlite_stat1 WHERE tbl = 'posts'"
+        ).fetchone()
+        assert stats[0] > 0
+
+    def test_legacy_iso_timestamps_migrated_to_epoch(self, tmp_path) -> None:
+        """Test ISO text timestamps from schema v1 become epoch integers."""
+        import sqlite3
+
+        db_path = str(tmp_path / "legacy.db")
+        DatabaseManager(db_path).close()
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "INSERT INTO posts (uri, cid, author_handle, author_did, text, "
+                "created_at, indexed_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    "at://legacy/1",
+                    "c",
+                    "a",
+                    "d",
+                    "t",
+                    "2024-01-01T12:00:00",
+                    "2024-01-01 13:00:00",
+                ),
+            )
+            conn.execute(
+                "UPDATE metadata SET value = '1' WHERE key = 'schema_version'"
+            )
+            conn.execute("PRAGMA user_version = 0")
+
+        db_manager = DatabaseManager(db_path)
+        noon = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+        posts: List[Post] = db_manager.get_posts_by_date_range(
+            noon - timedelta(hours=1), noon + timedelta(hours=1)
+        )
+        assert [p.created_at for p in posts] == [noon]
+        assert db_manager.get_metadata("schema_version") == "2"
+        # Later managers see the header version and skip schema setup
+        assert db_manager._conn.execute("PRAGMA user_version").fetchone() == (
+            _SCHEMA_VERSION,
+        )
+        db_manager.close()
+
+    def test_upgraded_schema_stamps_epoch_indexed_at(self, tmp_path) -> None:
+        """Test posts saved into a v1-schema database still hit the summary cache."""
+        import sqlite3
+
+        db_path = str(tmp_path / "baseline.db")
+        with sqlite3.connect(db_path) as conn:
+            conn.executescript(
+                """
+                CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+                CREATE TABLE posts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    uri TEXT UNIQUE NOT NULL,
+                    cid TEXT NOT NULL,
+                    author_handle TEXT NOT NULL,
+                    author_did TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    created_at TIMESTAMP NOT NULL,
+                    like_count INTEGER DEFAULT 0,
+                    repost_count INTEGER DEFAULT 0,
+                    reply_count INTEGER DEFAULT 0,
+                    indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+                CREATE TABLE summaries (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    start_date TIMESTAMP NOT NULL,
+                    end_date TIMESTAMP NOT NULL,
+                    post_count INTEGER NOT NULL,
+                    summary_text TEXT NOT NULL,
+                    model_used TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+                INSERT INTO metadata (key, value) VALUES ('schema_version', '1');
+                """
+            )
+        conn.close()
+
+        db_manager = DatabaseManager(db_path)
+        try:
+            now: datetime = datetime.now(timezone.utc)
+            start_date: datetime = now - timedelta(hours=2)
+            db_manager.save_posts(
+                [
+                    Post(
+                        uri="at://test/post/1",
+                        cid="cid1",
+                        author_handle="test.bsky.social",
+                        author_did="did:plc:test",
+                        text="Post",
+                        created_at=now - timedelta(hours=1),
+                        indexed_at=now,
+                    )
+                ]
+            )
+            stored = db_manager._conn.execute(
+                "SELECT typeof(indexed_at) FROM posts"
+            ).fetchone()
+            assert stored == ("integer",)
+
+            db_manager.save_summary(
+                Summary(
+                    start_date=start_date,
+                    end_date=now,
+                    post_count=1,
+                    summary_text="Cached summary",
+                    model_used="model",
+                    created_at=now + timedelta(seconds=1),
+                )
+            )
+            cached = db_manager.get_summary_by_range(start_date, now, "model")
+            assert cached is not None
+            assert cached.summary_text == "Cached summary"
+        finally:
+            db_manager.close()
+
+    def test_range_count_uses_covering_index(self) -> None:
+        """Test the filtered range count is answered from an index alone."""
+        now: datetime = datetime.now(timezone.utc)
+        where, params = self.db_manager._date_range_filter(now, now, "alice")
+        plan = self.db_manager._conn.execute(
+            f"EXPLAIN QUERY PLAN SELECT COUNT(*) FROM posts WHERE {where}", params
+        ).fetchall()
+        assert "COVERING INDEX idx_posts_created_covering" in plan[0][-1]
+
     def test_save_and_retrieve_post(self) -> None:
         """Test saving and retrieving a post."""
         now: datetime = datetime.now(timezone.utc)
@@ -325,6 +769,83 @@ class TestDatabaseOperations:
         assert retrieved_post.uri == "at://test/post/123"
         assert retrieved_post.text == "Test post"
 
+        # Saving again updates the row in place and keeps its id
+        updated: Post = post.model_copy(update={"like_count": 9})
+        assert self.db_manager.save_post(updated) == post_id
+        posts = self.db_manager.get_posts_by_date_range(start_date, end_date)
+        assert [p.like_count for p in posts] == [9]
+
+    def test_get_posts_filters_and_limits_in_sql(self) -> None:
+        """Test author filtering, ordering and limit are applied by the query."""
+        now: datetime = datetime.now(timezone.utc)
+        handles = ["Alice.bsky.social", "bob.bsky.social", "alice_b.bsky.social"]
+        posts: List[Post] = [
+            Post(
+                uri=f"at://test/post/{i}",
+                cid=f"cid{i}",
+                author_handle=handle,
+                author_did=f"did:plc:{i}",
+                text=f"Post {i}",
+                created_at=now - timedelta(minutes=10 - i),
+                indexed_at=now,
+            )
+            for i, handle in enumerate(handles)
+        ]
+        self.db_manager.save_posts(posts)
+
+        start_date: datetime = now - timedelta(hours=1)
+        end_date: datetime = now + timedelta(hours=1)
+
+        alice = self.db_manager.get_posts_by_date_range(
+            start_date, end_date, author_substr="alice"
+        )
+        assert [p.uri for p in alice] == ["at://test/post/0", "at://test/post/2"]
+        assert (
+            self.db_manager.count_posts_by_date_range(
+                start_date, end_date, author_substr="alice"
+            )
+            == 2
+        )
+
+        # LIKE wildcards in the filter are matched literally
+        assert self.db_manager.count_posts_by_date_range(
+            start_date, end_date, author_substr="e_b"
+        ) == 1
+
+        limited = self.db_manager.get_posts_by_date_range(start_date, end_date, limit=2)
+        assert [p.uri for p in limited] == ["at://test/post/0", "at://test/post/1"]
+        streamed = self.db_manager.iter_posts_by_date_range(
+            start_date, end_date, limit=2, chunk_size=1
+        )
+        assert [p.uri for p in streamed] == [p.uri for p in limited]
+        assert self.db_manager.count_posts_by_date_range(start_date, end_date) == 3
+
+    def test_prune_posts_older_than_utc_cutoff(self) -> None:
+        """Test pruning compares stored epoch timestamps against a UTC cutoff."""
+        now: datetime = datetime.now(timezone.utc)
+        posts: List[Post] = [
+            Post(
+                uri=f"at://test/post/{i}",
+                cid=f"cid{i}",
+                author_handle="test.bsky.social",
+                author_did="did:plc:test",
+                text=f"Post {i}",
+                created_at=now - timedelta(days=days_old),
+                indexed_at=now,
+            )
+            for i, days_old in enumerate([10, 9, 8, 1])
+        ]
+        self.db_manager.save_posts(posts)
+
+        # Chunks smaller than the backlog are deleted one after another
+        with patch("bluesky_summarizer.database.operations._PRUNE_CHUNK_SIZE", 2):
+            deleted: int = self.db_manager.prune_posts_older_than(
+                now - timedelta(days=7)
+            )
+
+        assert deleted == 3
+        assert self.db_manager.get_total_post_count() == 1
+
     def test_save_and_retrieve_summary(self) -> None:
         """Test saving and retrieving a summary."""
         now: datetime = datetime.now(timezone.utc)
@@ -348,6 +869,50 @@ class TestDatabaseOperations:
         assert latest_summary.summary_text == "Test summary"
         assert latest_summary.post_count == 5
 
+    def test_summary_cache_invalidated_by_later_fetch(self) -> None:
+        """Test a saved summary is reused until posts in its range are re-saved."""
+        now: datetime = datetime.now(timezone.utc)
+        start_date: datetime = now - timedelta(days=1)
+        model: str = "claude-3-7-sonnet-latest"
+
+        def save_post() -> None:
+            self.db_manager.save_posts(
+                [
+                    Post(
+                        uri="at://test/post/1",
+                        cid="cid1",
+                        author_handle="test.bsky.social",
+                        author_did="did:plc:test",
+                        text="Post",
+                        created_at=now - timedelta(hours=1),
+                        indexed_at=now,
+                    )
+                ]
+            )
+
+        # indexed_at is stamped by SQLite, so backdate the first fetch directly
+        save_post()
+        self.db_manager._conn.execute("UPDATE posts SET indexed_at = indexed_at - 600")
+        self.db_manager.save_summary(
+            Summary(
+                start_date=start_date,
+                end_date=now,
+                post_count=1,
+                summary_text="Cached summary",
+                model_used=model,
+                created_at=now - timedelta(minutes=1),
+            )
+        )
+
+        cached = self.db_manager.get_summary_by_range(start_date, now, model)
+        assert cached is not None
+        assert cached.summary_text == "Cached summary"
+        assert self.db_manager.get_summary_by_range(start_date, now, "other") is None
+
+        # A later fetch touching a post in the range makes the summary stale
+        save_post()
+        assert self.db_manager.get_summary_by_range(start_date, now, model) is None
+
     def test_post_uniqueness_by_uri(self) -> None:
         """Test that posts are unique by URI."""
         now: datetime = datetime.now(timezone.utc)
@@ -406,6 +971,155 @@ class TestDatabaseOperations:
         assert updated_post.text == "Updated post text"
         assert updated_post.like_count == 10
 
+    def test_get_top_posts_orderings(self) -> None:
+        """Test top posts are ranked by the requested engagement metric."""
+        now: datetime = datetime.now(timezone.utc)
+        self.db_manager.save_posts(
+            [
+                Post(
+                    uri=f"at://test/post/{name}",
+                    cid="cid",
+                    author_handle="test.bsky.social",
+                    author_did="did:plc:test",
+                    text=name,
+                    created_at=now,
+                    like_count=likes,
+                    repost_count=reposts,
+                    indexed_at=now,
+                )
+                for name, likes, reposts in [("liked", 5, 0), ("shared", 1, 9)]
+            ]
+        )
+        start_date: datetime = now - timedelta(hours=1)
+        end_date: datetime = now + timedelta(hours=1)
+
+        def top(order_by: str) -> List[str]:
+            posts = self.db_manager.get_top_posts(start_date, end_date, 1, order_by)
+            return [p.text for p in posts]
+
+        assert top("like_count") == ["liked"]
+        assert top("repost_count") == ["shared"]
+        assert top("total_engagement") == ["shared"]
+        with pytest.raises(ValueError, match="order_by"):
+            top("created_at")
+
+    def test_get_existing_uris_large_batch(self) -> None:
+        """Test existence lookups above SQLite's bound-parameter limit."""
+        now: datetime = datetime.now(timezone.utc)
+        saved: List[str] = [f"at://test/post/{i}" for i in range(0, 1200, 2)]
+        self.db_manager.save_posts(
+            [
+                Post(
+                    uri=uri,
+                    cid="cid",
+                    author_handle="test.bsky.social",
+                    author_did="did:plc:test",
+                    text=uri,
+                    created_at=now,
+                    indexed_at=now,
+                )
+                for uri in saved
+            ]
+        )
+
+        queried: List[str] = [f"at://test/post/{i}" for i in range(1200)]
+        assert self.db_manager.get_existing_uris(queried) == set(saved)
+        assert self.db_manager.get_existing_uris([]) == set()
+
+    def test_existence_checks_see_other_managers_writes(self) -> None:
+        """Test existence checks see posts saved by another manager."""
+        now: datetime = datetime.now(timezone.utc)
+        post: Post = Post(
+            uri="at://test/post/known",
+            cid="cid",
+            author_handle="test.bsky.social",
+            author_did="did:plc:test",
+            text="Known post",
+            created_at=now,
+            indexed_at=now,
+        )
+        assert self.db_manager.get_existing_uris([post.uri]) == set()
+
+        # e.g. the stream worker and a fetch writing the same file
+        other: DatabaseManager = DatabaseManager(TEST_DB_PATH)
+        other.save_posts([post])
+        other.close()
+        assert self.db_manager.get_existing_uris([post.uri]) == {post.uri}
+
+        self.db_manager.prune_posts_older_than(now + timedelta(seconds=1))
+        assert self.db_manager.get_existing_uris([post.uri]) == set()
+
+        # The single-URI form still works but is deprecated
+        with pytest.deprecated_call():
+            assert self.db_manager.post_exists(post.uri) is False
+
+    def test_async_manager_round_trip(self) -> None:
+        """Test the async wrapper saves and reads posts from an event loop."""
+        import asyncio
+
+        from bluesky_summarizer.database import AsyncDatabaseManager
+
+        now: datetime = datetime.now(timezone.utc)
+        post: Post = Post(
+            uri="at://test/post/async",
+            cid="cid",
+            author_handle="test.bsky.social",
+            author_did="did:plc:test",
+            text="Async post",
+            created_at=now,
+            indexed_at=now,
+        )
+
+        async def run() -> tuple:
+            async with AsyncDatabaseManager(
+                TEST_DB_PATH, pool_size=2, cache_size_kib=1024, mmap_size=0
+            ) as db:
+                assert db._db.cache_size_kib == 1024
+                assert db._db.mmap_size == 0
+                saved = await db.save_posts([post])
+                posts, existing = await asyncio.gather(
+                    db.get_posts_by_date_range(
+                        now - timedelta(hours=1), now + timedelta(hours=1)
+                    ),
+                    db.get_existing_uris([post.uri, "at://test/post/missing"]),
+                )
+            return saved, posts, existing
+
+        saved, posts, existing = asyncio.run(run())
+        assert saved["new"] == 1
+        assert [p.uri for p in posts] == [post.uri]
+        assert existing == {post.uri}
+
+    def test_bulk_save_skips_failing_rows(self) -> None:
+        """Test a row rejected by SQLite does not discard the rest of the batch."""
+        now: datetime = datetime.now(timezone.utc)
+        self.db_manager._conn.execute(
+            "CREATE TEMP TRIGGER reject_bad BEFORE INSERT ON posts "
+            "WHEN NEW.uri = 'at://test/post/bad' "
+            "BEGIN SELECT RAISE(ABORT, 'rejected'); END"
+        )
+        posts: List[Post] = [
+            Post(
+                uri=f"at://test/post/{name}",
+                cid="cid",
+                author_handle="test.bsky.social",
+                author_did="did:plc:test",
+                text=name,
+                created_at=now,
+                indexed_at=now,
+            )
+            for name in ("first", "bad", "last")
+        ]
+
+        result: dict[str, int] = self.db_manager.save_posts(posts)
+        self.db_manager._conn.execute("DROP TRIGGER temp.reject_bad")
+
+        assert result == {"new": 2, "updated": 0, "total": 2}
+        assert self.db_manager.get_existing_uris([p.uri for p in posts]) == {
+            "at://test/post/first",
+            "at://test/post/last",
+        }
+
     def test_bulk_save_with_duplicates(self) -> None:
         """Test bulk saving posts with some duplicates."""
         now: datetime = datetime.now(timezone.utc)
@@ -519,6 +1233,11 @@ class TestDatabaseOperations:
         assert total_posts == 3
         assert unique_uris == 3
         assert duplicate_content == 1  # One text appears twice
+        assert self.db_manager.get_verification_stats() == {
+            "total_posts": total_posts,
+            "unique_uris": unique_uris,
+            "duplicate_content": duplicate_content,
+        }
 
         # Test duplicate detection
         duplicate_uris: List[str] = self.db_manager.find_duplicate_uris()
@@ -532,6 +1251,12 @@ class TestDatabaseOperations:
         assert content_duplicates[0][0] == "Duplicate content"
         assert content_duplicates[0][1] == 2  # Appears twice
 
+        # Rows written without a text hash (e.g. by other tools) still count
+        self.db_manager._conn.execute(
+            "UPDATE posts SET text_hash = NULL WHERE uri = ?", (posts[1].uri,)
+        )
+        assert self.db_manager.get_duplicate_content_count() == 1
+
 
 class TestClaudeSummarizer:
     """Test Claude AI summarizer."""
@@ -601,6 +1326,92 @@ class TestClaudeSummarizer:
         assert "3 likes" in formatted_text
         assert "5 likes" in formatted_text
 
+    def test_truncation_keeps_most_engaging_in_chronological_order(self) -> None:
+        """Test truncation keeps top-engagement posts, ordered by time."""
+        base: datetime = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        posts: List[Post] = [
+            Post(
+                uri=f"at://test/post/{i}",
+                cid=f"cid{i}",
+                author_handle="user.bsky.social",
+                author_did="did:plc:user",
+                text="x" * 100,
+                created_at=base + timedelta(minutes=i),
+                like_count=likes,
+                indexed_at=base,
+            )
+            for i, likes in enumerate([1, 50, 2, 40])
+        ]
+        one_post = len(self.summarizer._format_posts_for_summarization(posts[:1]))
+
+        selected: List[Post] = self.summarizer._truncate_posts(
+            posts, 2 * (one_post + 1) + 10
+        )
+
+        assert [p.uri for p in selected] == ["at://test/post/1", "at://test/post/3"]
+
+    def test_prompt_budget_limited_by_token_estimate(self) -> None:
+        """Test the token budget, not the char cap, bounds the prompt posts."""
+        from bluesky_summarizer.ai.summarizer import CHARS_PER_TOKEN
+        from bluesky_summarizer.config import AppConfig
+
+        base: datetime = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        posts: List[Post] = [
+            Post(
+                uri=f"at://test/post/{i}",
+                cid=f"cid{i}",
+                author_handle="user.bsky.social",
+                author_did="did:plc:user",
+                text="x" * 100,
+                created_at=base + timedelta(minutes=i),
+                indexed_at=base,
+            )
+            for i in range(50)
+        ]
+        app = AppConfig(max_prompt_chars=20000, max_prompt_tokens=250)
+        mock_config = Mock(app=app)
+
+        with patch("bluesky_summarizer.ai.summarizer.config", mock_config):
+            selected, _ = self.summarizer._prepare_summary_payload(
+                posts, base, base + timedelta(days=1)
+            )
+
+        formatted = self.summarizer._format_posts_for_summarization(selected)
+        assert 0 < len(selected) < len(posts)
+        assert len(formatted) <= app.max_prompt_tokens * CHARS_PER_TOKEN
+        # The defaults make the token estimate the binding limit too
+        defaults = AppConfig()
+        assert defaults.max_prompt_tokens * CHARS_PER_TOKEN < defaults.max_prompt_chars
+
+    def test_engagement_stats_block(self) -> None:
+        """Test pre-aggregated engagement stats for the prompt."""
+        base: datetime = datetime(2024, 1, 1, 9, 0, 0, tzinfo=timezone.utc)
+        posts: List[Post] = [
+            Post(
+                uri=f"at://test/post/{i}",
+                cid=f"cid{i}",
+                author_handle=f"user{i % 2}.bsky.social",
+                author_did=f"did:plc:user{i % 2}",
+                text=f"Post {i}",
+                created_at=base + timedelta(hours=i % 2),
+                like_count=i,
+                repost_count=0,
+                reply_count=0,
+                indexed_at=base,
+            )
+            for i in range(5)
+        ]
+
+        assert [p.like_count for p in top_k_by_likes(posts, 2)] == [4, 3]
+        assert hour_histogram(posts)[9] == 3
+        assert hour_histogram(posts)[10] == 2
+        assert engagement_percentiles(posts)["p50"] == 2
+
+        block: str = format_stats_block(posts)
+        assert "Posts: 5, distinct authors: 2" in block
+        assert "09:00 (3)" in block
+        assert format_stats_block([]) == ""
+
     def test_summary_generation_with_mock_simulation(self) -> None:
         """Test summary generation with simulated Claude API."""
         # Create a mock client
@@ -652,6 +1463,210 @@ class TestClaudeSummarizer:
         assert call_args[1]["max_tokens"] == 1000
         assert call_args[1]["temperature"] == 0.3
 
+        # Static instructions are sent as a cached system block
+        system_blocks = call_args[1]["system"]
+        assert system_blocks[0]["cache_control"] == {"type": "ephemeral"}
+        assert "Key Themes" in system_blocks[0]["text"]
+        user_content = call_args[1]["messages"][0]["content"]
+        assert "Test post content" in user_content[0]["text"]
+
+    def test_summary_streams_tokens_to_callback(self) -> None:
+        """Test summaries are streamed when an on_token callback is given."""
+        mock_client = MagicMock()
+        mock_stream = mock_client.messages.stream.return_value.__enter__.return_value
+        mock_stream.text_stream = iter(["Streamed ", "summary"])
+        mock_stream.get_final_message.return_value.content = [
+            Mock(text="Streamed summary")
+        ]
+        self.summarizer.client = mock_client
+
+        now: datetime = datetime.now(timezone.utc)
+        posts: List[Post] = [
+            Post(
+                uri="at://test/post/1",
+                cid="cid1",
+                author_handle="user1.bsky.social",
+                author_did="did:plc:user1",
+                text="Test post content",
+                created_at=now,
+                indexed_at=now,
+            )
+        ]
+
+        tokens: List[str] = []
+        summary: Summary = self.summarizer.summarize_posts(
+            posts, now - timedelta(hours=1), now, on_token=tokens.append
+        )
+
+        assert tokens == ["Streamed ", "summary"]
+        assert summary.summary_text == "Streamed summary"
+        mock_client.messages.create.assert_not_called()
+
+    def test_batched_summaries_map_results_to_jobs(self) -> None:
+        """Test batched summarization maps batch results back to job order."""
+        now: datetime = datetime.now(timezone.utc)
+        post: Post = Post(
+            uri="at://test/post/1",
+            cid="cid1",
+            author_handle="user1.bsky.social",
+            author_did="did:plc:user1",
+            text="Batched post",
+            created_at=now,
+            like_count=1,
+            repost_count=0,
+            reply_count=0,
+            indexed_at=now,
+        )
+
+        mock_client = Mock()
+        mock_batch = Mock()
+        mock_batch.id = "batch_1"
+        mock_batch.processing_status = "ended"
+        mock_client.messages.batches.create.return_value = mock_batch
+
+        mock_result = Mock()
+        mock_result.custom_id = "summary-1"
+        mock_result.result.type = "succeeded"
+        mock_result.result.message.content = [Mock(text="Batched summary")]
+        mock_client.messages.batches.results.return_value = [mock_result]
+
+        self.summarizer.client = mock_client
+
+        jobs = [
+            ([], now - timedelta(days=2), now - timedelta(days=1)),
+            ([post], now - timedelta(hours=1), now + timedelta(hours=1)),
+        ]
+        summaries: List[Summary] = self.summarizer.summarize_posts_batched(jobs)
+
+        assert len(summaries) == 2
+        assert summaries[0].post_count == 0
+        assert summaries[1].summary_text == "Batched summary"
+        assert summaries[1].post_count == 1
+
+        requests = mock_client.messages.batches.create.call_args[1]["requests"]
+        assert len(requests) == 1
+        assert requests[0]["custom_id"] == "summary-1"
+        assert requests[0]["params"]["system"][0]["cache_control"] == {
+            "type": "ephemeral"
+        }
+
+
+class TestConfig:
+    """Test configuration loading."""
+
+    def test_sections_load_independently(self, monkeypatch) -> None:
+        """Test a section only requires its own environment variables."""
+        monkeypatch.delenv("BLUESKY_HANDLE", raising=False)
+        monkeypatch.setenv("DATABASE_PATH", "/tmp/only_db.db")
+        cfg: Config = Config()
+
+        assert cfg.database.path == "/tmp/only_db.db"
+        with pytest.raises(ValueError, match="BLUESKY_HANDLE"):
+            cfg.bluesky
+        # Sections are built once
+        assert cfg.database is cfg.database
+
+    def test_malformed_database_setting_names_variable(
+        self, monkeypatch, tmp_path
+    ) -> None:
+        """Test a bad SQLite tuning value fails clearly and status still runs."""
+        from click.testing import CliRunner
+
+        from bluesky_summarizer.cli import cli
+
+        monkeypatch.setenv("DATABASE_CACHE_SIZE_KIB", "64MB")
+        monkeypatch.setenv("DATABASE_PATH", str(tmp_path / "status.db"))
+        cfg: Config = Config()
+        with pytest.raises(ValueError, match="DATABASE_CACHE_SIZE_KIB"):
+            cfg.database
+
+        with patch("bluesky_summarizer.cli.config", cfg):
+            result = CliRunner().invoke(cli, ["status"])
+        assert result.exit_code == 0
+        assert "Database Path" in result.output
+
+
+class TestFetchWindowPlanning:
+    """Test incremental fetch window planning."""
+
+    def test_plan_fetch_window(self) -> None:
+        """Test only the uncovered newer gap is fetched."""
+        now: datetime = datetime.now(timezone.utc)
+        coverage = (now - timedelta(days=2), now - timedelta(hours=1))
+
+        # Nothing fetched yet: whole window
+        assert _plan_fetch_window(now - timedelta(days=1), now, None) == (
+            now - timedelta(days=1),
+            now,
+        )
+        # Older edge covered: only the newer gap
+        assert _plan_fetch_window(now - timedelta(days=1), now, coverage) == (
+            now - timedelta(hours=1),
+            now,
+        )
+        # Fully covered: nothing to fetch
+        assert (
+            _plan_fetch_window(
+                now - timedelta(days=1), now - timedelta(hours=2), coverage
+            )
+            is None
+        )
+        # Older edge not covered: whole window
+        assert _plan_fetch_window(now - timedelta(days=3), now, coverage) == (
+            now - timedelta(days=3),
+            now,
+        )
+
+    def test_fetch_coverage_roundtrip(self) -> None:
+        """Test fetch coverage is persisted in database metadata."""
+        db_manager: DatabaseManager = DatabaseManager(TEST_DB_PATH)
+        now: datetime = datetime.now(timezone.utc)
+
+        try:
+            db_manager.set_fetch_coverage(now - timedelta(days=1), now)
+
+            assert db_manager.get_fetch_coverage() == (now - timedelta(days=1), now)
+        finally:
+            db_manager.close()
+
+    def test_prune_trims_fetch_coverage(self, tmp_path) -> None:
+        """Test a fetch after pruning goes back to the network for the gap."""
+        from bluesky_summarizer.cli import _fetch_posts_logic
+
+        now: datetime = datetime.now(timezone.utc)
+        start: datetime = now - timedelta(days=3)
+        post: Post = Post(
+            uri="at://test/post/old",
+            cid="cid",
+            author_handle="test.bsky.social",
+            author_did="did:plc:test",
+            text="Old post",
+            created_at=now - timedelta(days=2),
+            indexed_at=now,
+        )
+        db_manager: DatabaseManager = DatabaseManager(str(tmp_path / "prune.db"))
+        try:
+            with patch("bluesky_summarizer.bluesky.BlueSkyClient") as client_cls:
+                client = client_cls.return_value
+                client.authenticate.return_value = True
+                client.fetch_timeline_posts.return_value = [post]
+
+                _fetch_posts_logic(start, now, 10, db_manager=db_manager)
+                assert db_manager.get_fetch_coverage() == (start, now)
+
+                cutoff: datetime = now - timedelta(days=1)
+                assert db_manager.prune_posts_older_than(cutoff) == 1
+                assert db_manager.get_fetch_coverage() == (cutoff, now)
+
+                _fetch_posts_logic(start, now, 10, db_manager=db_manager)
+                assert client.fetch_timeline_posts.call_count == 2
+                assert db_manager.get_existing_uris([post.uri]) == {post.uri}
+
+            # Pruning past the covered window clears it
+            db_manager.prune_posts_older_than(now + timedelta(seconds=1))
+            assert db_manager.get_fetch_coverage() is None
+        finally:
+            db_manager.close()
 
 # Integration tests
 class TestIntegration:
@@ -4,6 +4,7 @@ Tests for the Bluesky streaming service.
 
 import pytest
 import threading
+import time
 from datetime import datetime, timezone, timedelta
 from unittest.mock import Mock, patch
 from typing import List
@@ -358,23 +359,53 @@ class TestStreamingService:
         service = StreamingService(db_manager=mock_db_manager)
 
         # Mock the entire start method to avoid blocking behavior
-        with (
-            patch.object(service, "_authenticate", return_value=True),
-            patch.object(service, "_worker_loop"),
-        ):
-            # Test start - we'll manually set the state instead of calling start()
-            service.is_running = True
-            service.start_time = datetime.now(timezone.utc)
+        with patch.object(service, "_authenticate", return_value=True):
+            with patch.object(service, "_worker_loop"):
+                # Test start - we'll manually set the state instead of calling start()
+                service.is_running = True
+                service.start_time = datetime.now(timezone.utc)
 
-            # Verify the service would be configured correctly
-            assert service.is_running is True
-            assert service.start_time is not None
+                # Verify the service would be configured correctly
+                assert service.is_running is True
+                assert service.start_time is not None
 
         # Test stop
         service.stop()
 
         assert service.is_running is False
 
+    def test_start_non_blocking(self, mock_db_manager):
+        """Test start(block=False) returns with the worker running."""
+        mock_db_manager.get_metadata.return_value = None
+        service = StreamingService(db_manager=mock_db_manager)
+
+        with patch.object(service, "_authenticate", return_value=True):
+            with patch.object(
+                service, "_worker_loop", side_effect=lambda: service._stop_event.wait()
+            ):
+                service._authenticated = True
+                service.start(block=False)
+                assert service.is_running is True
+                assert service._worker_thread.is_alive()
+
+                service.stop()
+
+        assert service.is_running is False
+        assert not service._worker_thread.is_alive()
+
+    def test_wait_returns_when_stopped(self, mock_db_manager):
+        """Test wait() times out while running and returns promptly on stop."""
+        service = StreamingService(db_manager=mock_db_manager)
+        service.is_running = True
+        service.start_time = datetime.now(timezone.utc)
+
+        assert service.wait(0.01) is False
+
+        threading.Timer(0.05, service.stop).start()
+        started = time.monotonic()
+        assert service.wait(5) is True
+        assert time.monotonic() - started < 1
+
     def test_signal_handler_setup(self, mock_db_manager):
         """Test that streaming service initializes without signal handlers (caller manages signals)."""
         with patch("signal.signal") as mock_signal: